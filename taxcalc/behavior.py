@@ -107,6 +107,10 @@ class Behavior(ParametersBase):
                     return True
         return False
 
+    # records variables changed by the response method
+    RESPONSE_VARS = set(['e00200', 'e00200p', 'e00300', 'e19200', 'p23250',
+                         'e19800', 'e20100'])
+
     @staticmethod
     def response(calc_x, calc_y):
         """
@@ -147,16 +151,32 @@ class Behavior(ParametersBase):
         # pylint: disable=too-many-statements,too-many-locals,too-many-branches
         assert calc_x.records.dim == calc_y.records.dim
         assert calc_x.records.current_year == calc_y.records.current_year
+        # calculate all the marginal tax rates used below, computing the
+        # base level of taxes only once for each Calculator object
+        zero_sub_and_inc = (calc_y.behavior.BE_sub == 0.0 and
+                            calc_y.behavior.BE_inc == 0.0)
+        no_charity_response = (calc_y.behavior.BE_charity.tolist() ==
+                               [0.0, 0.0, 0.0])
+        mtr_of_list = list()
+        if not zero_sub_and_inc:
+            mtr_of_list.append('e00200p')
+        if calc_y.behavior.BE_cg != 0.0:
+            mtr_of_list.append('p23250')
+        if not no_charity_response:
+            mtr_of_list.extend(['e19800', 'e20100'])
+        if mtr_of_list:
+            mtrs_xy = (calc_x.mtr_many(mtr_of_list,
+                                       wrt_full_compensation=True),
+                       calc_y.mtr_many(mtr_of_list,
+                                       wrt_full_compensation=True))
         # calculate sum of substitution and income effects
-        if calc_y.behavior.BE_sub == 0.0 and calc_y.behavior.BE_inc == 0.0:
-            zero_sub_and_inc = True
-        else:
-            zero_sub_and_inc = False
+        if not zero_sub_and_inc:
             # calculate marginal combined tax rates on taxpayer wages+salary
             # (e00200p is taxpayer's wages+salary)
             wage_mtr_x, wage_mtr_y = Behavior._mtr_xy(calc_x, calc_y,
                                                       mtr_of='e00200p',
-                                                      tax_type='combined')
+                                                      tax_type='combined',
+                                                      mtrs_xy=mtrs_xy)
             # calculate magnitude of substitution effect
             if calc_y.behavior.BE_sub == 0.0:
                 sub = np.zeros(calc_x.records.dim)
@@ -196,14 +216,13 @@ class Behavior(ParametersBase):
             # (p23250 is filing units' long-term capital gains)
             ltcg_mtr_x, ltcg_mtr_y = Behavior._mtr_xy(calc_x, calc_y,
                                                       mtr_of='p23250',
-                                                      tax_type='iitax')
+                                                      tax_type='iitax',
+                                                      mtrs_xy=mtrs_xy)
             rch = ltcg_mtr_y - ltcg_mtr_x
             exp_term = np.exp(calc_y.behavior.BE_cg * rch)
             new_ltcg = calc_x.records.p23250 * exp_term
             ltcg_chg = new_ltcg - calc_x.records.p23250
         # calculate charitable giving effect
-        no_charity_response = (calc_y.behavior.BE_charity.tolist() ==
-                               [0.0, 0.0, 0.0])
         if no_charity_response:
             c_charity_chg = np.zeros(calc_x.records.dim)
             nc_charity_chg = np.zeros(calc_x.records.dim)
@@ -213,12 +232,14 @@ class Behavior(ParametersBase):
             # e20100 is filing units' non-cash charitable contributions
             # cash:
             c_charity_mtr_x, c_charity_mtr_y = Behavior._mtr_xy(
-                calc_x, calc_y, mtr_of='e19800', tax_type='combined')
+                calc_x, calc_y, mtr_of='e19800', tax_type='combined',
+                mtrs_xy=mtrs_xy)
             c_charity_price_pch = (((1. + c_charity_mtr_y) /
                                     (1. + c_charity_mtr_x)) - 1.)
             # non-cash:
             nc_charity_mtr_x, nc_charity_mtr_y = Behavior._mtr_xy(
-                calc_x, calc_y, mtr_of='e20100', tax_type='combined')
+                calc_x, calc_y, mtr_of='e20100', tax_type='combined',
+                mtrs_xy=mtrs_xy)
             nc_charity_price_pch = (((1. + nc_charity_mtr_y) /
                                      (1. + nc_charity_mtr_x)) - 1.)
             # identify income bin based on baseline income
@@ -280,7 +301,7 @@ class Behavior(ParametersBase):
         calc_y_behv = Behavior._update_charity(c_charity_chg, nc_charity_chg,
                                                calc_y_behv)
         # Recalculate post-reform taxes incorporating behavioral responses
-        calc_y_behv.calc_all()
+        calc_y_behv.calc_all(changed_vars=Behavior.RESPONSE_VARS)
         return calc_y_behv
 
     # ----- begin private methods of Behavior class -----
@@ -350,6 +371,7 @@ class Behavior(ParametersBase):
         """
         Implement earnings change induced by earnings response.
         """
+        calc.records.make_writable(['e00200', 'e00200p'])
         calc.records.e00200 += change
         calc.records.e00200p += change
         return calc
@@ -380,6 +402,8 @@ class Behavior(ParametersBase):
         # confirm that the three parts are consistent with delta_income
         assert np.allclose(delta_income, delta_winc + delta_oinc - delta_ided)
         # add the three parts to different calc.records variables
+        calc.records.make_writable(['e00200', 'e00200p', 'e00300',
+                                   'e19200'])
         calc.records.e00200 += delta_winc
         calc.records.e00200p += delta_winc
         calc.records.e00300 += delta_oinc
@@ -391,6 +415,7 @@ class Behavior(ParametersBase):
         """
         Implement capital gain change induced by behavioral responses.
         """
+        calc.records.make_writable(['p23250'])
         calc.records.p23250 += cap_gain_change
         return calc
 
@@ -400,18 +425,26 @@ class Behavior(ParametersBase):
         Implement cash charitable contribution change induced
         by behavioral responses.
         """
+        calc.records.make_writable(['e19800', 'e20100'])
         calc.records.e19800 += cash_charity_change
         calc.records.e20100 += non_cash_charity_change
         return calc
 
     @staticmethod
-    def _mtr_xy(calc_x, calc_y, mtr_of='e00200p', tax_type='combined'):
+    def _mtr_xy(calc_x, calc_y, mtr_of='e00200p', tax_type='combined',
+                mtrs_xy=None):
         """
         Computes marginal tax rates for Calculator objects calc_x and calc_y
         for specified mtr_of income type and specified tax_type.
+        If mtrs_xy is not None, it is the pair of dictionaries returned by
+        the Calculator.mtr_many method for calc_x and calc_y, from which
+        the marginal tax rates are extracted instead of being computed.
         """
-        _, iitax_x, combined_x = calc_x.mtr(mtr_of, wrt_full_compensation=True)
-        _, iitax_y, combined_y = calc_y.mtr(mtr_of, wrt_full_compensation=True)
+        if mtrs_xy is None:
+            mtrs_xy = (calc_x.mtr_many([mtr_of], wrt_full_compensation=True),
+                       calc_y.mtr_many([mtr_of], wrt_full_compensation=True))
+        _, iitax_x, combined_x = mtrs_xy[0][mtr_of]
+        _, iitax_y, combined_y = mtrs_xy[1][mtr_of]
         if tax_type == 'combined':
             return (combined_x, combined_y)
         elif tax_type == 'iitax':
@@ -0,0 +1,60 @@
+"""
+Tax-Calculator benchmark script that measures the throughput, in filing
+units per second, of the Calculator.calc_all method when using one
+thread and when using the number of threads given by the --threads
+option.
+"""
+# CODING-STYLE CHECKS:
+# pep8 --ignore=E402 calc_all_throughput.py
+# pylint --disable=locally-disabled calc_all_throughput.py
+
+import argparse
+import os
+import sys
+import time
+CUR_PATH = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(os.path.join(CUR_PATH, '..', '..'))
+# pylint: disable=import-error,wrong-import-position
+from taxcalc import Policy, Calculator
+from common import (add_data_arguments, read_sample, make_records,
+                    best_time)
+
+
+def main():
+    """
+    Contains high-level logic of the script.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python calc_all_throughput.py',
+        description=('Measures calc_all throughput in records/sec using '
+                     'one thread and using several threads.'))
+    add_data_arguments(parser, default_frac=1.0)
+    parser.add_argument('--number',
+                        help='number of calc_all calls in each trial; '
+                        'default is 3',
+                        type=int,
+                        default=3)
+    parser.add_argument('--threads',
+                        help='number of threads in the parallel trials; '
+                        'default is 2',
+                        type=int,
+                        default=2)
+    args = parser.parse_args()
+    sample = read_sample(args)
+    for num_threads in [1, args.threads]:
+        calc = Calculator(policy=Policy(),
+                          records=make_records(sample, args),
+                          verbose=False, num_threads=num_threads)
+        start = time.time()
+        calc.calc_all()
+        compile_secs = time.time() - start
+        secs = best_time(calc.calc_all, args.number)
+        label = '{} thread(s)'.format(num_threads)
+        row = '{:<14s}{:>14,.0f} records/sec{:>10.1f} sec first call\n'
+        sys.stdout.write(row.format(label, calc.records.dim / secs,
+                                    compile_secs))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Tax-Calculator benchmark utilities used by the scripts in this directory.
+"""
+# CODING-STYLE CHECKS:
+# pep8 --ignore=E402 common.py
+# pylint --disable=locally-disabled common.py
+
+import os
+import sys
+import timeit
+import pandas as pd
+CUR_PATH = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(os.path.join(CUR_PATH, '..', '..'))
+# pylint: disable=import-error,wrong-import-position
+from taxcalc import Records, Growfactors
+
+
+CPS_PATH = os.path.join(CUR_PATH, '..', 'cps.csv.gz')
+
+
+def add_data_arguments(parser, default_frac=0.01):
+    """
+    Add to argparse parser the arguments that specify the input data.
+    """
+    parser.add_argument('--data',
+                        help=('name of CSV-formatted input file; '
+                              'default is the cps.csv.gz file'),
+                        default=CPS_PATH)
+    parser.add_argument('--frac',
+                        help=('fraction of input records to sample; '
+                              'default is {}'.format(default_frac)),
+                        type=float,
+                        default=default_frac)
+    parser.add_argument('--year',
+                        help=('calendar year of the input data when '
+                              'not using cps.csv.gz; default is 2014'),
+                        type=int,
+                        default=2014)
+
+
+def read_sample(args):
+    """
+    Return DataFrame containing the sample of input records specified
+    by the parsed args.
+    """
+    fullsample = pd.read_csv(args.data)
+    if args.frac >= 1.0:
+        return fullsample
+    return fullsample.sample(frac=args.frac, random_state=123456789)
+
+
+def make_records(sample, args, gfactors=Growfactors(), block_storage=False):
+    """
+    Return Records object containing the sample DataFrame.
+    """
+    if os.path.abspath(args.data) == os.path.abspath(CPS_PATH):
+        return Records.cps_constructor(data=sample.copy(),
+                                       growfactors=gfactors,
+                                       block_storage=block_storage)
+    return Records(data=sample.copy(), gfactors=gfactors,
+                   weights=None, adjust_ratios=None,
+                   start_year=args.year, block_storage=block_storage)
+
+
+def best_time(stmt, number, repeat=3):
+    """
+    Return the best over repeat trials of the average number of seconds
+    it takes to execute stmt, which is a callable with no arguments.
+    """
+    times = timeit.repeat(stmt, number=number, repeat=repeat)
+    return min(times) / float(number)
+
+
+def write_row(label, seconds, baseline=None):
+    """
+    Write to stdout one row of timing results.
+    """
+    row = '{:<40s}{:>12.3f} msec'.format(label, seconds * 1e3)
+    if baseline is not None:
+        row += '{:>10.1f}x'.format(baseline / seconds)
+    sys.stdout.write(row + '\n')
@@ -0,0 +1,82 @@
+"""
+Tax-Calculator benchmark script that times the per-call overhead of
+iterate_jit-decorated functions with and without the cache of compiled
+high-level functions kept by each decorated function.
+"""
+# CODING-STYLE CHECKS:
+# pep8 --ignore=E402 iterate_jit_overhead.py
+# pylint --disable=locally-disabled iterate_jit_overhead.py
+
+import argparse
+import os
+import sys
+CUR_PATH = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(os.path.join(CUR_PATH, '..', '..'))
+# pylint: disable=import-error,wrong-import-position
+from taxcalc import Policy, Calculator
+from taxcalc.functions import EI_PayrollTax, AGI, EITC
+from common import (add_data_arguments, read_sample, make_records,
+                    best_time, write_row)
+
+
+def main():
+    """
+    Contains high-level logic of the script.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python iterate_jit_overhead.py',
+        description=('Times the per-call overhead of iterate_jit-decorated '
+                     'functions on a small Records sample.'))
+    add_data_arguments(parser, default_frac=0.001)
+    parser.add_argument('--number',
+                        help='number of calls in each trial; default is 200',
+                        type=int,
+                        default=200)
+    args = parser.parse_args()
+    calc = Calculator(policy=Policy(),
+                      records=make_records(read_sample(args), args),
+                      verbose=False)
+    calc.calc_all()  # makes sure all functions are jit-compiled
+    sys.stdout.write('Records sample size: {}\n'.format(calc.records.dim))
+    for name, func in [('EI_PayrollTax', EI_PayrollTax),
+                       ('AGI', AGI),
+                       ('EITC', EITC)]:
+        def uncached_call(func=func):
+            """
+            Simulate the old behavior that compiled the high-level
+            function on every call.
+            """
+            func.hl_func_cache.clear()
+            func(calc.policy, calc.records)
+
+        def cached_call(func=func):
+            """
+            Call func using the compiled high-level function cache.
+            """
+            func(calc.policy, calc.records)
+
+        before = best_time(uncached_call, args.number)
+        after = best_time(cached_call, args.number)
+        write_row('{} uncached'.format(name), before)
+        write_row('{} cached'.format(name), after, before)
+    before = best_time(lambda: _calc_all_uncached(calc), 5)
+    after = best_time(calc.calc_all, 5)
+    write_row('calc_all uncached', before)
+    write_row('calc_all cached', after, before)
+    return 0
+
+
+def _calc_all_uncached(calc):
+    """
+    Clear the cache of every iterate_jit-decorated function and call
+    calc_all, which simulates the old behavior.
+    """
+    from taxcalc import functions
+    for obj in vars(functions).values():
+        if hasattr(obj, 'hl_func_cache'):
+            obj.hl_func_cache.clear()
+    calc.calc_all()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Tax-Calculator benchmark script that measures the time it takes to
+construct a Policy object and to implement a policy reform, which are
+dominated by the expansion of the parameter values across the budget
+years, and that compares the vectorized expansion of a two-dimensional
+parameter with the element-by-element expansion it replaced.
+"""
+# CODING-STYLE CHECKS:
+# pep8 --ignore=E402 policy_construction.py
+# pylint --disable=locally-disabled policy_construction.py
+
+import argparse
+import os
+import sys
+import numpy as np
+CUR_PATH = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(os.path.join(CUR_PATH, '..', '..'))
+# pylint: disable=import-error,wrong-import-position
+from taxcalc import Policy
+from taxcalc.parameters import ParametersBase
+from common import best_time, write_row
+
+
+REFORM = {
+    2018: {'_II_em': [5000],
+           '_STD': [[13000, 26000, 13000, 19500, 26000]],
+           '_II_brk7': [[500000, 600000, 300000, 550000, 500000]]},
+    2020: {'_EITC_c': [[600, 3500, 5700, 6400]],
+           '_SS_Earnings_c': [150000]}
+}
+
+
+def loop_expand_2D(x, inflation_rates, num_years):
+    """
+    Return x inflated to num_years rows one element at a time, as the
+    ParametersBase._expand_2D method did before it was vectorized.
+    """
+    ans = np.zeros((num_years, x.shape[1]), dtype=np.float64)
+    ans[:len(x), :] = x
+    for i in range(x.shape[0], ans.shape[0]):
+        for j in range(ans.shape[1]):
+            cur = ans[i - 1, j] * (1. + inflation_rates[i - 1])
+            ans[i, j] = round(cur, 2) if cur < 9e99 else 9e99
+    return ans
+
+
+def implement_reform():
+    """
+    Construct a Policy object and implement REFORM.
+    """
+    pol = Policy()
+    pol.implement_reform(REFORM)
+
+
+def main():
+    """
+    Contains high-level logic of the script.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python policy_construction.py',
+        description=('Measures the time it takes to construct a Policy '
+                     'object and to implement a policy reform.'))
+    parser.add_argument('--number',
+                        help=('number of calls in each trial; '
+                              'default is 20'),
+                        type=int,
+                        default=20)
+    args = parser.parse_args()
+    pol = Policy()
+    rates = pol.inflation_rates()
+    num_years = pol.num_years
+    x2d = np.array(pol.default_data()['_EITC_c'][:1])
+    loop = best_time(lambda: loop_expand_2D(x2d, rates, num_years),
+                     args.number * 10)
+    vec = best_time(lambda: ParametersBase._expand_2D(x2d, True, rates,
+                                                      num_years),
+                    args.number * 10)
+    write_row('_expand_2D element loop', loop)
+    write_row('_expand_2D vectorized', vec, loop)
+    write_row('Policy()', best_time(Policy, args.number))
+    write_row('Policy() and implement_reform',
+              best_time(implement_reform, args.number))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
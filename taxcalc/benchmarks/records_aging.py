@@ -0,0 +1,85 @@
+"""
+Tax-Calculator benchmark script that measures the time it takes to
+extrapolate Records data from the data year to a later year by calling
+the Records.increment_year method once for each year and by calling the
+Records.age_to method once, as well as the average cost of extrapolating
+the data one year.
+"""
+# CODING-STYLE CHECKS:
+# pep8 --ignore=E402 records_aging.py
+# pylint --disable=locally-disabled records_aging.py
+
+import argparse
+import copy
+import os
+import sys
+CUR_PATH = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(os.path.join(CUR_PATH, '..', '..'))
+# pylint: disable=import-error,wrong-import-position
+from taxcalc import Growfactors
+from common import (add_data_arguments, read_sample, make_records,
+                    best_time, write_row)
+
+
+def increment_years(recs, year):
+    """
+    Extrapolate a copy of recs to year one year at a time.
+    """
+    aged = copy.deepcopy(recs)
+    while aged.current_year < year:
+        aged.increment_year()
+
+
+def age_to_year(recs, year):
+    """
+    Extrapolate a copy of recs to year in one step.
+    """
+    aged = copy.deepcopy(recs)
+    aged.age_to(year)
+
+
+def main():
+    """
+    Contains high-level logic of the script.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python records_aging.py',
+        description=('Measures the time it takes to extrapolate Records '
+                     'data to a later year one year at a time and in '
+                     'one step.  The time it takes to copy the Records '
+                     'object before each extrapolation is excluded.'))
+    add_data_arguments(parser, default_frac=1.0)
+    parser.add_argument('--to',
+                        help=('year to which data are extrapolated; '
+                              'default is the last grow factors year'),
+                        type=int,
+                        default=Growfactors().last_year)
+    parser.add_argument('--number',
+                        help=('number of extrapolations in each trial; '
+                              'default is 3'),
+                        type=int,
+                        default=3)
+    args = parser.parse_args()
+    recs = make_records(read_sample(args), args)
+    if args.to <= recs.current_year:
+        parser.error('--to year must be after the data year')
+    # extrapolate once before timing so that one-time costs are excluded
+    age_to_year(recs, recs.current_year + 1)
+    copy_secs = best_time(lambda: copy.deepcopy(recs), args.number)
+    loop = best_time(lambda: increment_years(recs, args.to),
+                     args.number) - copy_secs
+    step = best_time(lambda: age_to_year(recs, args.to),
+                     args.number) - copy_secs
+    first = best_time(lambda: age_to_year(recs, recs.current_year + 1),
+                      args.number) - copy_secs
+    span = '{}-{}'.format(recs.current_year, args.to)
+    write_row('increment_year loop ' + span, loop)
+    write_row('age_to ' + span, step, loop)
+    write_row('age_to per year ' + span,
+              step / (args.to - recs.current_year))
+    write_row('age_to first year', first)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Tax-Calculator benchmark script that measures the time it takes to do
+whole-record operations on a Records object whose variable arrays are
+stored separately and on one whose variable arrays are stored in blocks.
+"""
+# CODING-STYLE CHECKS:
+# pep8 --ignore=E402 records_blocks.py
+# pylint --disable=locally-disabled records_blocks.py
+
+import argparse
+import copy
+import os
+import sys
+CUR_PATH = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(os.path.join(CUR_PATH, '..', '..'))
+# pylint: disable=import-error,wrong-import-position
+from taxcalc import Policy, Records, Calculator
+from common import (add_data_arguments, read_sample, make_records,
+                    best_time, write_row)
+
+
+def operation_times(recs, number):
+    """
+    Return dictionary containing the time it takes to do each
+    whole-record operation on recs.
+    """
+    calc = Calculator(policy=Policy(), records=recs, verbose=False)
+    calc.calc_all()
+    varnames = Records.USABLE_READ_VARS | Records.CALCULATED_VARS
+    snap = recs.snapshot(varnames)
+    return {
+        'deepcopy': best_time(lambda: copy.deepcopy(recs), number),
+        'zero_out_changing_calculated_vars': best_time(
+            recs.zero_out_changing_calculated_vars, number),
+        'snapshot': best_time(lambda: recs.snapshot(varnames), number),
+        'restore': best_time(lambda: recs.restore(snap), number),
+        'to_dataframe': best_time(recs.to_dataframe, number),
+        'calc_all': best_time(calc.calc_all, number)
+    }
+
+
+def main():
+    """
+    Contains high-level logic of the script.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python records_blocks.py',
+        description=('Measures the time it takes to do whole-record '
+                     'operations on Records objects without and with '
+                     'block storage of the variable arrays.'))
+    add_data_arguments(parser, default_frac=1.0)
+    parser.add_argument('--number',
+                        help=('number of operations in each trial; '
+                              'default is 10'),
+                        type=int,
+                        default=10)
+    args = parser.parse_args()
+    sample = read_sample(args)
+    separate = operation_times(make_records(sample, args), args.number)
+    blocks = operation_times(make_records(sample, args, block_storage=True),
+                             args.number)
+    for name in sorted(separate):
+        write_row(name, separate[name])
+        write_row(name + ' (blocks)', blocks[name], separate[name])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
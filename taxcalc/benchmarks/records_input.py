@@ -0,0 +1,74 @@
+"""
+Tax-Calculator benchmark script that measures the time it takes to
+construct a Records object from a CSV-formatted input file, from the
+NPZ file written by the Records.write_npz method and from the directory
+of memory-mapped column files written by the Records.write_columns method.
+"""
+# CODING-STYLE CHECKS:
+# pep8 --ignore=E402 records_input.py
+# pylint --disable=locally-disabled records_input.py
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+CUR_PATH = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(os.path.join(CUR_PATH, '..', '..'))
+# pylint: disable=import-error,wrong-import-position
+from taxcalc import Records
+from common import CPS_PATH, best_time, write_row
+
+
+def main():
+    """
+    Contains high-level logic of the script.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python records_input.py',
+        description=('Measures the time it takes to construct a Records '
+                     'object from CSV-formatted, from NPZ and from '
+                     'memory-mapped column input data.'))
+    parser.add_argument('--data',
+                        help=('name of CSV-formatted input file; '
+                              'default is the cps.csv.gz file'),
+                        default=CPS_PATH)
+    parser.add_argument('--year',
+                        help=('calendar year of the input data; '
+                              'default is 2014'),
+                        type=int,
+                        default=2014)
+    parser.add_argument('--number',
+                        help=('number of constructions in each trial; '
+                              'default is 3'),
+                        type=int,
+                        default=3)
+    args = parser.parse_args()
+    tmpdir = tempfile.mkdtemp()
+    try:
+        npz_path = os.path.join(tmpdir, 'data' + Records.NPZ_SUFFIX)
+        Records.write_npz(args.data, npz_path)
+        columns_path = os.path.join(tmpdir, 'columns')
+        Records.write_columns(args.data, columns_path)
+        csv = best_time(lambda: Records(data=args.data, weights=None,
+                                        adjust_ratios=None,
+                                        start_year=args.year),
+                        args.number)
+        npz = best_time(lambda: Records(data=npz_path, weights=None,
+                                        adjust_ratios=None,
+                                        start_year=args.year),
+                        args.number)
+        mmap = best_time(lambda: Records(data=columns_path, weights=None,
+                                         adjust_ratios=None,
+                                         start_year=args.year),
+                         args.number)
+    finally:
+        shutil.rmtree(tmpdir)
+    write_row('Records from CSV file', csv)
+    write_row('Records from NPZ file', npz, csv)
+    write_row('Records from memory-mapped columns', mmap, csv)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Tax-Calculator benchmark script that measures the time it takes to
+calculate the weighted tax totals for a sweep over the values of one
+policy parameter using a plain loop of calc_all calls and using the
+Calculator.reform_sweep method in this process and in worker processes.
+"""
+# CODING-STYLE CHECKS:
+# pep8 --ignore=E402 reform_sweep.py
+# pylint --disable=locally-disabled reform_sweep.py
+
+import argparse
+import copy
+import os
+import sys
+import numpy as np
+CUR_PATH = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(os.path.join(CUR_PATH, '..', '..'))
+# pylint: disable=import-error,wrong-import-position
+from taxcalc import Policy, Calculator
+from common import (add_data_arguments, read_sample, make_records,
+                    best_time, write_row)
+
+
+def plain_loop(calc, reforms):
+    """
+    Return list of the weighted tax totals for each reform calculated by
+    calling calc_all after implementing the reform in a copy of the policy
+    of the specified calc object.
+    """
+    policy = calc.policy
+    totals = list()
+    for reform in reforms:
+        pol = copy.deepcopy(policy)
+        pol.implement_reform(reform)
+        calc.policy = pol
+        calc.calc_all()
+        totals.append([(calc.records.s006 *
+                        getattr(calc.records, var)).sum() * 1e-9
+                       for var in Calculator.SWEEP_TAX_VARIABLES])
+    calc.policy = policy
+    return totals
+
+
+def main():
+    """
+    Contains high-level logic of the script.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python reform_sweep.py',
+        description=('Measures the time it takes to evaluate a sweep '
+                     'over the values of one policy parameter.'))
+    add_data_arguments(parser, default_frac=1.0)
+    parser.add_argument('--param',
+                        help=('name of the swept policy parameter; '
+                              'default is _II_rt7'),
+                        default='_II_rt7')
+    parser.add_argument('--reforms',
+                        help='number of reforms in the sweep; default is 8',
+                        type=int,
+                        default=8)
+    parser.add_argument('--workers',
+                        help=('number of worker processes used by '
+                              'reform_sweep; default is 2'),
+                        type=int,
+                        default=2)
+    args = parser.parse_args()
+    calc = Calculator(policy=Policy(),
+                      records=make_records(read_sample(args), args),
+                      verbose=False)
+    calc.calc_all()
+    value = np.array(getattr(calc.policy, args.param[1:]))
+    reforms = [{calc.current_year: {args.param: [value * (1.0 + 0.01 * idx)]}}
+               for idx in range(args.reforms)]
+    plain_loop(calc, reforms[:1])
+    calc.reform_sweep(reforms[:1])
+    loop_secs = best_time(lambda: plain_loop(calc, reforms), 1)
+    write_row('plain calc_all loop', loop_secs)
+    write_row('reform_sweep',
+              best_time(lambda: calc.reform_sweep(reforms), 1), loop_secs)
+    write_row('reform_sweep ({} workers)'.format(args.workers),
+              best_time(lambda: calc.reform_sweep(reforms, args.workers), 1),
+              loop_secs)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +1,2 @@
 from taxcalc.cli.tc import cli_tc_main
+from taxcalc.cli.tc_npz import cli_tc_npz_main
@@ -0,0 +1,85 @@
+"""
+Command-line interface (CLI) that converts a CSV-formatted Records input
+file into the NPZ format read by the Records class without text parsing
+(or into a directory of column files memory-mapped by the Records class),
+which can be accessed as 'tc-npz' from an installed taxcalc conda package.
+"""
+# CODING-STYLE CHECKS:
+# pep8 --ignore=E402 tc_npz.py
+# pylint --disable=locally-disabled tc_npz.py
+
+import os
+import sys
+import argparse
+from taxcalc import Records
+
+
+def npz_filename(csv_filename, columns=False):
+    """
+    Return name of NPZ file (or of columns directory when columns is True)
+    corresponding to specified CSV file name.
+    """
+    name = csv_filename
+    for suffix in ['.gz', '.csv']:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    if columns:
+        return name + '_columns'
+    return name + Records.NPZ_SUFFIX
+
+
+def cli_tc_npz_main():
+    """
+    Contains command-line interface to the Records.write_npz and
+    Records.write_columns methods.
+    """
+    parser = argparse.ArgumentParser(
+        prog='',
+        usage='tc-npz INPUT [OUTPUT] [--columns]',
+        description=('Writes to the OUTPUT file the Records input variables '
+                     'in the CSV-formatted INPUT file in the NPZ format, '
+                     'which can be specified as the data argument of the '
+                     'Records class constructor.  Variables in INPUT that '
+                     'are not Records input variables are not written.'))
+    parser.add_argument('INPUT',
+                        help=('INPUT is name of CSV-formatted file that '
+                              'contains Records input variables, for '
+                              'example, the cps.csv.gz file included in '
+                              'the taxcalc package.'))
+    parser.add_argument('OUTPUT', nargs='?',
+                        help=('OUTPUT is name of NPZ file to write; '
+                              'default is INPUT with its .csv or .csv.gz '
+                              'suffix replaced by .npz (or by _columns '
+                              'when --columns is specified)'),
+                        default=None)
+    parser.add_argument('--columns',
+                        help=('optional flag that causes OUTPUT to be a '
+                              'directory containing one NPY file for each '
+                              'Records input variable, which the Records '
+                              'class memory-maps so that processes using '
+                              'the same OUTPUT share its pages.'),
+                        default=False,
+                        action="store_true")
+    args = parser.parse_args()
+    if not os.path.isfile(args.INPUT):
+        sys.stderr.write('ERROR: INPUT file {} does not exist\n'.format(
+            args.INPUT))
+        return 1
+    output = args.OUTPUT
+    if output is None:
+        output = npz_filename(args.INPUT, args.columns)
+    try:
+        if args.columns:
+            Records.write_columns(args.INPUT, output)
+        else:
+            Records.write_npz(args.INPUT, output)
+    except ValueError as valerr:
+        sys.stderr.write('ERROR: {}\n'.format(valerr))
+        return 1
+    sys.stdout.write('Wrote {}\n'.format(output))
+    return 0
+# end of cli_tc_npz_main function code
+
+
+if __name__ == '__main__':
+    sys.exit(cli_tc_npz_main())
@@ -97,6 +97,7 @@ class Consumption(ParametersBase):
         """
         if not isinstance(records, Records):
             raise ValueError('records is not a Records object')
+        records.make_writable(Consumption.RESPONSE_VARS)
         for var in Consumption.RESPONSE_VARS:
             records_var = getattr(records, var)
             mpc_var = getattr(self, 'MPC_{}'.format(var))
@@ -6,9 +6,12 @@ the functions.py module.
 # pep8 --ignore=E402 decorators.py
 # pylint --disable=locally-disabled decorators.py
 
+import os
 import ast
 import inspect
+import six
 import toolz
+import pandas as pd
 from six import StringIO
 from taxcalc.policy import Policy
 
@@ -33,9 +36,11 @@ def id_wrapper(*dec_args, **dec_kwargs):  # pylint: disable=unused-argument
 try:
     import numba
     jit = numba.jit  # pylint: disable=invalid-name
+    prange = numba.prange  # pylint: disable=invalid-name
     DO_JIT = True
 except (ImportError, AttributeError):
     jit = id_wrapper  # pylint: disable=invalid-name
+    prange = range  # pylint: disable=invalid-name
     DO_JIT = False
 # One way to use the Python debugger is to do these two things:
 #    (a) uncomment the two lines below item (b) in this comment, and
@@ -58,7 +63,7 @@ class GetReturnNode(ast.NodeVisitor):
             return [node.value.id]
 
 
-def create_apply_function_string(sigout, sigin, parameters):
+def create_apply_function_string(sigout, sigin, parameters, parallel=False):
     """
     Create a string for a function of the form::
 
@@ -69,6 +74,7 @@ def create_apply_function_string(sigout, sigin, parameters):
 
     where the specific args to jitted_f and the number of
     values to return is determined by sigout and sigin.
+    When parallel is True, the loop uses prange instead of range.
 
     Parameters
     ----------
@@ -80,6 +86,9 @@ def create_apply_function_string(sigout, sigin, parameters):
                 variables (as opposed to column records). This influences
                 how we construct the apply-style function
 
+    parallel: boolean specifying whether or not the loop over records
+              is a numba.prange loop that is executed in parallel
+
     Returns
     -------
     a String representing the function
@@ -90,7 +99,10 @@ def create_apply_function_string(sigout, sigin, parameters):
     in_args = ["x_" + str(i) for i in range(len(sigout), total_len)]
 
     fstr.write("def ap_func({0}):\n".format(",".join(out_args + in_args)))
-    fstr.write("  for i in range(len(x_0)):\n")
+    if parallel:
+        fstr.write("  for i in prange(len(x_0)):\n")
+    else:
+        fstr.write("  for i in range(len(x_0)):\n")
     out_index = [x + "[i]" for x in out_args]
     in_index = []
     for arg, _var in zip(in_args, sigin):
@@ -101,7 +113,42 @@ def create_apply_function_string(sigout, sigin, parameters):
     return fstr.getvalue()
 
 
-def create_toplevel_function_string(args_out, args_in, pm_or_pf):
+def get_values(x):
+    """
+    Return the underlying numpy array of x if x is a Pandas Series;
+    otherwise, return x unchanged.
+    """
+    if isinstance(x, pd.Series):
+        return x.values
+    return x
+
+
+def use_threads(num_threads):
+    """
+    Return True if loops over records should be executed in parallel
+    using num_threads threads, in which case the number of threads used
+    by numba is set to num_threads (but never more than the maximum
+    number of threads specified by the NUMBA_NUM_THREADS environment
+    variable, which by default is the number of CPU cores).  Return
+    False if num_threads is one or numba is not available.
+
+    Unless the NUMBA_THREADING_LAYER environment variable says otherwise,
+    numba is told to use its workqueue threading layer, which must happen
+    before the first parallel loop is compiled.  The TBB and GNU OpenMP
+    layers numba would otherwise prefer are not fork safe: a process that
+    has run parallel loops on them and later forks a multiprocessing
+    pool hangs at exit.
+    """
+    if num_threads <= 1 or not DO_JIT:
+        return False
+    if 'NUMBA_THREADING_LAYER' not in os.environ:
+        numba.config.THREADING_LAYER = 'workqueue'
+    numba.set_num_threads(min(num_threads, numba.config.NUMBA_NUM_THREADS))
+    return True
+
+
+def create_toplevel_function_string(args_out, args_in, pm_or_pf,
+                                    dataframe=True):
     """
     Create a string for a function of the form:
 
@@ -110,6 +157,14 @@ def create_toplevel_function_string(args_out, args_in, pm_or_pf):
             header = [...]
             return DataFrame(data, columns=header)
 
+    or, when dataframe is False, a function of the form:
+
+        def hl_func(x_0, x_1, x_2, ...):
+            (...) = calc_func(...)
+
+    which returns None and allocates no memory beyond the in-place
+    writes into the output arrays done by calc_func.
+
     Parameters
     ----------
     args_out: iterable of the out arguments
@@ -118,6 +173,9 @@ def create_toplevel_function_string(args_out, args_in, pm_or_pf):
 
     pm_or_pf: iterable of strings for object that holds each arg
 
+    dataframe: boolean specifying whether or not the function returns
+               a DataFrame containing the values of the out arguments
+
     Returns
     -------
     a String representing the function
@@ -125,25 +183,24 @@ def create_toplevel_function_string(args_out, args_in, pm_or_pf):
     fstr = StringIO()
     fstr.write("def hl_func(pm, pf")
     fstr.write("):\n")
-    fstr.write("    from pandas import DataFrame\n")
-    fstr.write("    import numpy as np\n")
-    fstr.write("    import pandas as pd\n")
-    fstr.write("    def get_values(x):\n")
-    fstr.write("        if isinstance(x, pd.Series):\n")
-    fstr.write("            return x.values\n")
-    fstr.write("        else:\n")
-    fstr.write("            return x\n")
-    fstr.write("    outputs = \\\n")
-
-    outs = []
-    for ppp, attr in zip(pm_or_pf, args_out + args_in):
-        outs.append(ppp + "." + attr + ", ")
+    if dataframe:
+        fstr.write("    from pandas import DataFrame\n")
+        fstr.write("    import numpy as np\n")
+        fstr.write("    import pandas as pd\n")
+        fstr.write("    def get_values(x):\n")
+        fstr.write("        if isinstance(x, pd.Series):\n")
+        fstr.write("            return x.values\n")
+        fstr.write("        else:\n")
+        fstr.write("            return x\n")
+        fstr.write("    outputs = \\\n")
     outs = [m_or_f + "." + arg for m_or_f, arg in zip(pm_or_pf, args_out)]
     fstr.write("        (" + ", ".join(outs) + ") = \\\n")
     fstr.write("        " + "applied_f(")
     for ppp, attr in zip(pm_or_pf, args_out + args_in):
         fstr.write("get_values(" + ppp + "." + attr + ")" + ", ")
     fstr.write(")\n")
+    if not dataframe:
+        return fstr.getvalue()
     fstr.write("    header = [")
     col_headers = ["'" + out + "'" for out in args_out]
     fstr.write(", ".join(col_headers))
@@ -158,7 +215,7 @@ def create_toplevel_function_string(args_out, args_in, pm_or_pf):
 
 
 def make_apply_function(func, out_args, in_args, parameters,
-                        do_jit=DO_JIT, **kwargs):
+                        do_jit=DO_JIT, parallel=False, **kwargs):
     """
     Takes a calc-style function and creates the necessary Python code for
     an apply-style function. Will also jit the function if desired.
@@ -177,6 +234,9 @@ def make_apply_function(func, out_args, in_args, parameters,
 
     do_jit: Bool, if True, jit the resulting apply-style function
 
+    parallel: Bool, if True, the apply-style function loops over records
+              in parallel (only when do_jit is True)
+
     Returns
     -------
     apply-style function
@@ -185,12 +245,15 @@ def make_apply_function(func, out_args, in_args, parameters,
         jitted_f = jit(**kwargs)(func)
     else:
         jitted_f = func
-    apfunc = create_apply_function_string(out_args, in_args, parameters)
+    apfunc = create_apply_function_string(out_args, in_args, parameters,
+                                          parallel and do_jit)
     func_code = compile(apfunc, "<string>", "exec")
     fakeglobals = {}
     eval(func_code,  # pylint: disable=eval-used
-         {"jitted_f": jitted_f}, fakeglobals)
-    if do_jit:
+         {"jitted_f": jitted_f, "prange": prange}, fakeglobals)
+    if do_jit and parallel:
+        return jit(parallel=True, **kwargs)(fakeglobals['ap_func'])
+    elif do_jit:
         return jit(**kwargs)(fakeglobals['ap_func'])
     else:
         return fakeglobals['ap_func']
@@ -280,40 +343,259 @@ def iterate_jit(parameters=None, **kwargs):
         if not all_out_args:
             raise ValueError("Can't find return statement in function!")
 
-        # Now create the apply-style possibly-jitted function
-        applied_jitted_f = make_apply_function(func,
-                                               list(reversed(all_out_args)),
-                                               in_args,
-                                               parameters=all_parameters,
-                                               do_jit=DO_JIT,
-                                               **kwargs_for_jit)
+        # Now create the apply-style possibly-jitted function; the
+        # parallel version is created only when it is first needed
+        applied_jitted_f = {False: make_apply_function(
+            func, list(reversed(all_out_args)), in_args,
+            parameters=all_parameters, do_jit=DO_JIT, **kwargs_for_jit
+        )}
+
+        # Cache of compiled high-level functions keyed on the tuple that
+        # says whether each argument is found in the first (pm) or second
+        # (pf) argument object and on the dataframe and parallel flags,
+        # so that the high-level function source is compiled only once
+        # for each attribute layout
+        hl_func_cache = dict()
 
         def wrapper(*args, **kwargs):
             """
             wrapper function nested in make_wrapper function nested
             in iterate_jit decorator.
+
+            When called with dataframe=False, the wrapped function only
+            writes its results in place into the output arrays and returns
+            None; otherwise, it also returns a DataFrame containing the
+            output arrays.  When called with num_threads greater than one,
+            the loop over records is executed in parallel using that
+            number of threads (see the use_threads function).
             """
-            in_arrays = []
+            dataframe = kwargs.pop('dataframe', True)
+            parallel = use_threads(kwargs.pop('num_threads', 1))
             pm_or_pf = []
             for farg in all_out_args + in_args:
                 if hasattr(args[0], farg):
-                    in_arrays.append(getattr(args[0], farg))
                     pm_or_pf.append("pm")
                 elif hasattr(args[1], farg):
-                    in_arrays.append(getattr(args[1], farg))
                     pm_or_pf.append("pf")
-            # Create the high level function
-            high_level_func = create_toplevel_function_string(all_out_args,
-                                                              list(in_args),
-                                                              pm_or_pf)
-            func_code = compile(high_level_func, "<string>", "exec")
-            fakeglobals = {}
-            eval(func_code,  # pylint: disable=eval-used
-                 {"applied_f": applied_jitted_f}, fakeglobals)
-            high_level_fn = fakeglobals['hl_func']
+            cache_key = (tuple(pm_or_pf), dataframe, parallel)
+            high_level_fn = hl_func_cache.get(cache_key)
+            if high_level_fn is None:
+                if parallel not in applied_jitted_f:
+                    applied_jitted_f[parallel] = make_apply_function(
+                        func, list(reversed(all_out_args)), in_args,
+                        parameters=all_parameters, do_jit=DO_JIT,
+                        parallel=parallel, **kwargs_for_jit
+                    )
+                # Create the high level function
+                high_level_func = create_toplevel_function_string(
+                    all_out_args, list(in_args), pm_or_pf, dataframe
+                )
+                func_code = compile(high_level_func, "<string>", "exec")
+                fakeglobals = {}
+                eval(func_code,  # pylint: disable=eval-used
+                     {"applied_f": applied_jitted_f[parallel],
+                      "get_values": get_values}, fakeglobals)
+                high_level_fn = fakeglobals['hl_func']
+                hl_func_cache[cache_key] = high_level_fn
             ans = high_level_fn(*args, **kwargs)
             return ans
 
+        wrapper.hl_func_cache = hl_func_cache
+        wrapper.__name__ = func.__name__
+        # Expose the calc-style function and its argument lists so that
+        # several decorated functions can be composed by make_fused_function
+        if DO_JIT:
+            wrapper.calc_func = jit(**kwargs_for_jit)(func)
+        else:
+            wrapper.calc_func = func
+        wrapper.out_args = list(all_out_args)
+        wrapper.in_args = list(in_args)
+        wrapper.parameters = [arg for arg in in_args
+                              if arg in all_parameters]
         return wrapper
 
     return make_wrapper
+
+
+class GetNamesNode(ast.NodeVisitor):
+    """
+    A NodeVisitor to get the names read and written by Python statements.
+    """
+    def __init__(self):
+        self.names = list()
+        self.stored = list()
+
+    def visit_Name(self, node):  # pylint: disable=invalid-name
+        """
+        visit_Name is used by NodeVisitor.visit method.
+        """
+        if node.id not in self.names:
+            self.names.append(node.id)
+        if isinstance(node.ctx, ast.Store) and node.id not in self.stored:
+            self.stored.append(node.id)
+
+
+def create_fused_function_string(steps, columns, stored, parameters,
+                                 parallel=False):
+    """
+    Create a string for a function of the form::
+
+       def fused_func(arr_a, arr_b, ..., param_1, ...):
+           for i in range(len(arr_a)):
+               a = arr_a[i]
+               b = arr_b[i]
+               ...
+               (a, ...) = f_0(b, ..., param_1, ...)
+               <statements>
+               (b, ...) = f_1(a, ..., param_1, ...)
+               ...
+               arr_a[i] = a
+               arr_b[i] = b
+               ...
+
+    which loads each record's column values into local variables once,
+    executes all the steps on those local variables, and writes the
+    values of the stored columns back into the column arrays.
+
+    Parameters
+    ----------
+    steps: list of steps, each of which is either a tuple containing the
+           name of a calc-style function and its out and in arguments, or
+           a string containing Python statements executed for each record
+
+    columns: list of names of the column arrays used in the steps
+
+    stored: list of names of the columns written by the steps
+
+    parameters: list of names of the parameters used in the steps
+
+    parallel: boolean specifying whether or not the loop over records
+              is a numba.prange loop that is executed in parallel
+
+    Returns
+    -------
+    a String representing the function
+    """
+    fstr = StringIO()
+    arr_args = ["arr_" + col for col in columns]
+    fstr.write("def fused_func({0}):\n".format(
+        ",".join(arr_args + list(parameters))))
+    loop = "prange" if parallel else "range"
+    fstr.write("  for i in {0}(len({1})):\n".format(loop, arr_args[0]))
+    for col in columns:
+        fstr.write("    {0} = arr_{0}[i]\n".format(col))
+    for step in steps:
+        if isinstance(step, tuple):
+            fname, out_args, in_args = step
+            if len(out_args) == 1:
+                fstr.write("    " + out_args[0] + " = ")
+            else:
+                fstr.write("    (" + ",".join(out_args) + ") = ")
+            fstr.write(fname + "(" + ",".join(in_args) + ")\n")
+        else:
+            for line in step.strip("\n").split("\n"):
+                fstr.write("    " + line + "\n")
+    for col in stored:
+        fstr.write("    arr_{0}[i] = {0}\n".format(col))
+    return fstr.getvalue()
+
+
+def make_fused_function(steps, **jit_kwargs):
+    """
+    Takes a list of steps and creates a function that executes all the
+    steps for each record in a single loop.  Each step is either a
+    function decorated with iterate_jit or a string containing Python
+    statements that refer to record variables by name (any name that
+    is not an attribute of the function's arguments is a local
+    temporary variable).  The returned function is called the same way
+    as the functions decorated with iterate_jit; that is, with a pm
+    and pf argument whose attributes hold the parameters and the record
+    variables, and it writes its results in place and returns None.
+    Like the iterate_jit functions, it accepts a num_threads argument.
+    The fused function is jitted (when numba is available) so that each
+    record's values are loaded from memory only once for all the steps.
+    """
+    fnames = list()
+    fglobals = {"prange": prange}
+    parameters = list()
+    names = list()  # names of non-parameter variables used in the steps
+    stored_names = set()  # names of variables written by the steps
+    for step in steps:
+        if isinstance(step, six.string_types):
+            gnn = GetNamesNode()
+            gnn.visit(ast.parse(step.strip()))
+            step_names = gnn.names
+            stored_names.update(gnn.stored)
+        else:
+            fname = 'f_{}'.format(len(fnames))
+            fglobals[fname] = step.calc_func
+            fnames.append(fname)
+            for arg in step.parameters:
+                if arg not in parameters:
+                    parameters.append(arg)
+            step_names = step.out_args + step.in_args
+            stored_names.update(step.out_args)
+        for name in step_names:
+            if name not in names:
+                names.append(name)
+    names = [name for name in names if name not in parameters]
+    # Cache of jitted fused functions keyed on the resolved attribute layout
+    fused_cache = dict()
+
+    def wrapper(*args, **kwargs):
+        """
+        wrapper function nested in make_fused_function function.
+        """
+        parallel = use_threads(kwargs.pop('num_threads', 1))
+        pm_or_pf = list()
+        columns = list()
+        for name in names:
+            if hasattr(args[0], name):
+                pm_or_pf.append(0)
+            elif hasattr(args[1], name):
+                pm_or_pf.append(1)
+            else:
+                continue  # name is a local temporary variable
+            columns.append(name)
+        for name in parameters:
+            if hasattr(args[0], name):
+                pm_or_pf.append(0)
+            else:
+                pm_or_pf.append(1)
+        cache_key = (parallel, tuple(pm_or_pf + columns))
+        fused_fn = fused_cache.get(cache_key)
+        if fused_fn is None:
+            fsteps = list()
+            fnames_iter = iter(fnames)
+            for step in steps:
+                if isinstance(step, six.string_types):
+                    fsteps.append(step)
+                else:
+                    fsteps.append((next(fnames_iter),
+                                   step.out_args, step.in_args))
+            stored = [name for name in columns if name in stored_names]
+            fused_src = create_fused_function_string(fsteps, columns,
+                                                     stored, parameters,
+                                                     parallel)
+            func_code = compile(fused_src, "<string>", "exec")
+            fakeglobals = {}
+            eval(func_code,  # pylint: disable=eval-used
+                 fglobals, fakeglobals)
+            if DO_JIT:
+                fused_fn = jit(parallel=parallel,
+                               **jit_kwargs)(fakeglobals['fused_func'])
+            else:
+                fused_fn = fakeglobals['fused_func']
+            fused_cache[cache_key] = fused_fn
+        arrays = [get_values(getattr(args[idx], name))
+                  for idx, name in zip(pm_or_pf, columns + parameters)]
+        fused_fn(*arrays)
+
+    wrapper.fused_cache = fused_cache
+    # Like the iterate_jit functions, expose the names of the variables
+    # written and used by the steps (the names used may include local
+    # temporary variables, which are not attributes of the arguments)
+    wrapper.out_args = [name for name in names if name in stored_names]
+    wrapper.in_args = names + parameters
+    wrapper.parameters = list(parameters)
+    return wrapper
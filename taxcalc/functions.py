@@ -11,7 +11,6 @@ Tax-Calculator functions that calculate payroll and individual income taxes.
 # pylint: disable=too-many-locals
 
 import math
-import copy
 import numpy as np
 from taxcalc.decorators import iterate_jit, jit
 
@@ -875,11 +874,14 @@ def GainsTax(e00650, c01000, c23650, p23250, e01100, e58990,
 def AGIsurtax(c00100, MARS, AGI_surtax_trt, AGI_surtax_thd, taxbc, surtax):
     """
     AGIsurtax computes surtax on AGI above some threshold
+    and starts the surtax subtotal, which is augmented by later functions
     """
     if AGI_surtax_trt > 0.:
         hiAGItax = AGI_surtax_trt * max(c00100 - AGI_surtax_thd[MARS - 1], 0.)
         taxbc += hiAGItax
-        surtax += hiAGItax
+        surtax = hiAGItax
+    else:
+        surtax = 0.
     return (taxbc, surtax)
 
 
@@ -1552,25 +1554,18 @@ def ComputeBenefit(calc, ID_switch):
     """
     # compute income tax liability with no itemized deductions allowed for
     # the types of itemized deductions covered under the BenefitSurtax
-    no_ID_calc = copy.deepcopy(calc)
-    if ID_switch[0]:
-        no_ID_calc.policy.ID_Medical_hc = 1.
-    if ID_switch[1]:
-        no_ID_calc.policy.ID_StateLocalTax_hc = 1.
-    if ID_switch[2]:
-        no_ID_calc.policy.ID_RealEstate_hc = 1.
-    if ID_switch[3]:
-        no_ID_calc.policy.ID_Casualty_hc = 1.
-    if ID_switch[4]:
-        no_ID_calc.policy.ID_Miscellaneous_hc = 1.
-    if ID_switch[5]:
-        no_ID_calc.policy.ID_InterestPaid_hc = 1.
-    if ID_switch[6]:
-        no_ID_calc.policy.ID_Charity_hc = 1.
-    no_ID_calc._calc_one_year()  # pylint: disable=protected-access
-    benefit = np.where(
-        no_ID_calc.records.iitax - calc.records.iitax > 0.,
-        no_ID_calc.records.iitax - calc.records.iitax, 0.)
+    # (without copying the Calculator object and reusing AGI and the other
+    # variables calculated before the itemized deductions)
+    param_names = ['ID_Medical_hc', 'ID_StateLocalTax_hc', 'ID_RealEstate_hc',
+                   'ID_Casualty_hc', 'ID_Miscellaneous_hc',
+                   'ID_InterestPaid_hc', 'ID_Charity_hc']
+    param_values = dict()
+    for switch, param_name in zip(ID_switch, param_names):
+        if switch:
+            param_values[param_name] = 1.
+    no_ID_iitax = calc.counterfactual(param_values, ['iitax'])['iitax']
+    benefit = np.where(no_ID_iitax - calc.records.iitax > 0.,
+                       no_ID_iitax - calc.records.iitax, 0.)
     return benefit
 
 
@@ -7,6 +7,7 @@ Tax-Calculator Growfactors class.
 
 import os
 import six
+import numpy as np
 import pandas as pd
 from taxcalc.utils import read_egg_csv
 
@@ -46,21 +47,51 @@ class Growfactors(object):
                        'ASCHEI', 'ASCHEL', 'ASCHF',
                        'ASOCSEC', 'ATXPY', 'AUCOMP', 'AWAGE'])
 
+    # column order of the year-by-factor matrix
+    NAMES = tuple(sorted(VALID_NAMES))
+    NAME_INDEX = dict((name, idx) for idx, name in enumerate(NAMES))
+
+    # (years, matrix) for each growfactors file read in this process,
+    # keyed by file path and modification time
+    MATRIX_CACHE = dict()
+
     def __init__(self, growfactors_filename=FILE_PATH):
         # read grow factors from specified growfactors_filename
-        gfdf = pd.DataFrame()
-        if isinstance(growfactors_filename, six.string_types):
-            # pylint: disable=redefined-variable-type
-            # (above because pylint mistakenly thinks gfdf is not a DataFrame)
-            if os.path.isfile(growfactors_filename):
-                gfdf = pd.read_csv(growfactors_filename,
-                                   index_col='YEAR')
-            else:
-                # cannot call read_egg_ function in unit tests
-                gfdf = read_egg_csv(Growfactors.FILENAME,
-                                    index_col='YEAR')  # pragma: no cover
-        else:
+        if not isinstance(growfactors_filename, six.string_types):
             raise ValueError('growfactors_filename is not a string')
+        years, matrix = Growfactors._read_matrix(growfactors_filename)
+        # determine first_year and last_year from years
+        self._first_year = int(years[0])
+        self._last_year = int(years[-1])
+        # store factors as a dense year-by-factor matrix whose columns are
+        # in Growfactors.NAMES order; matrix is copied because update
+        # changes its contents
+        self._matrix = matrix.copy()
+        self._cumulative = None
+        # specify factors as being unused (that is, not yet accessed)
+        self.used = False
+
+    @staticmethod
+    def _read_matrix(growfactors_filename):
+        """
+        Return (years, matrix) tuple read from specified growfactors file,
+        where matrix has one row for each year in the years array and one
+        column for each name in Growfactors.NAMES.  Parsed files are cached
+        so that the returned arrays must not be modified by the caller.
+        """
+        if os.path.isfile(growfactors_filename):
+            key = (os.path.abspath(growfactors_filename),
+                   os.path.getmtime(growfactors_filename))
+        else:
+            key = (Growfactors.FILENAME, None)
+        if key in Growfactors.MATRIX_CACHE:
+            return Growfactors.MATRIX_CACHE[key]
+        if key[1] is not None:
+            gfdf = pd.read_csv(growfactors_filename, index_col='YEAR')
+        else:
+            # cannot call read_egg_ function in unit tests
+            gfdf = read_egg_csv(Growfactors.FILENAME,
+                                index_col='YEAR')  # pragma: no cover
         assert isinstance(gfdf, pd.DataFrame)
         # check validity of gfdf column names
         gfdf_names = set(list(gfdf))
@@ -69,14 +100,15 @@ class Growfactors(object):
             missing = Growfactors.VALID_NAMES - gfdf_names
             invalid = gfdf_names - Growfactors.VALID_NAMES
             raise ValueError(msg.format(missing, invalid))
-        # determine first_year and last_year from gfdf
-        self._first_year = min(gfdf.index)
-        self._last_year = max(gfdf.index)
-        # set gfdf as attribute of class
-        self.gfdf = pd.DataFrame()
-        setattr(self, 'gfdf', gfdf)
-        # specify factors as being unused (that is, not yet accessed)
-        self.used = False
+        years = np.array(gfdf.index, dtype=np.int64)
+        if not np.array_equal(years, np.arange(years[0], years[-1] + 1)):
+            raise ValueError('growfactors years are not consecutive')
+        matrix = np.array(gfdf[list(Growfactors.NAMES)].values,
+                          dtype=np.float64)
+        years.flags.writeable = False
+        matrix.flags.writeable = False
+        Growfactors.MATRIX_CACHE[key] = (years, matrix)
+        return years, matrix
 
     @property
     def first_year(self):
@@ -92,6 +124,16 @@ class Growfactors(object):
         """
         return self._last_year
 
+    @property
+    def gfdf(self):
+        """
+        Growfactors class DataFrame view of the year-by-factor matrix.
+        """
+        index = pd.Index(np.arange(self.first_year, self.last_year + 1),
+                         name='YEAR')
+        return pd.DataFrame(self._matrix, index=index,
+                            columns=list(Growfactors.NAMES), copy=False)
+
     def price_inflation_rates(self, firstyear, lastyear):
         """
         Return list of price inflation rates rounded to four decimal digits.
@@ -106,10 +148,7 @@ class Growfactors(object):
         if lastyear > self.last_year:
             msg = 'last_year={} > Growfactors.last_year={}'
             raise ValueError(msg.format(lastyear, self.last_year))
-        # pylint: disable=no-member
-        rates = [round((self.gfdf['ACPIU'][cyr] - 1.0), 4)
-                 for cyr in range(firstyear, lastyear + 1)]
-        return rates
+        return self._rates('ACPIU', firstyear, lastyear)
 
     def wage_growth_rates(self, firstyear, lastyear):
         """
@@ -125,10 +164,7 @@ class Growfactors(object):
         if lastyear > self.last_year:
             msg = 'lastyear={} > Growfactors.last_year={}'
             raise ValueError(msg.format(lastyear, self.last_year))
-        # pylint: disable=no-member
-        rates = [round((self.gfdf['AWAGE'][cyr] - 1.0), 4)
-                 for cyr in range(firstyear, lastyear + 1)]
-        return rates
+        return self._rates('AWAGE', firstyear, lastyear)
 
     def factor_value(self, name, year):
         """
@@ -138,19 +174,95 @@ class Growfactors(object):
         if name not in Growfactors.VALID_NAMES:
             msg = 'name={} not in Growfactors.VALID_NAMES'
             raise ValueError(msg.format(year, name))
+        self._check_year(year)
+        return self._matrix[year - self.first_year,
+                            Growfactors.NAME_INDEX[name]]
+
+    def factor_array(self, year):
+        """
+        Return read-only array of all factor values for specified year,
+        with the array elements in Growfactors.NAMES order.
+        """
+        self.used = True
+        self._check_year(year)
+        factors = self._matrix[year - self.first_year]
+        factors.flags.writeable = False
+        return factors
+
+    def cumulative_factor_array(self, from_year, to_year):
+        """
+        Return array of cumulative factor values that grow amounts for
+        from_year into amounts for to_year, which is the product of the
+        factors for each year after from_year up through to_year, with
+        the array elements in Growfactors.NAMES order.  Both years must
+        be in the [first_year, last_year] range and from_year cannot be
+        after to_year.
+
+        Notes
+        -----
+        The cumulative products are computed once (and recomputed only if
+        update is called before the factors are used), so each call takes
+        constant time.  Because each returned value is a ratio of two
+        cumulative products, it may differ in the last few bits from the
+        value obtained by multiplying the annual factors one by one.
+        """
+        self.used = True
+        if from_year > to_year:
+            msg = 'from_year={} > to_year={}'
+            raise ValueError(msg.format(from_year, to_year))
+        self._check_year(from_year)
+        self._check_year(to_year)
+        if self._cumulative is None:
+            self._cumulative = np.cumprod(self._matrix, axis=0)
+        if from_year == to_year:
+            return np.ones(len(Growfactors.NAMES))
+        return (self._cumulative[to_year - self.first_year] /
+                self._cumulative[from_year - self.first_year])
+
+    def cumulative_factor_value(self, name, from_year, to_year):
+        """
+        Return cumulative value of factor with specified name that grows
+        an amount for from_year into an amount for to_year.  See the
+        cumulative_factor_array method for details.
+        """
+        if name not in Growfactors.VALID_NAMES:
+            msg = 'name={} not in Growfactors.VALID_NAMES'
+            raise ValueError(msg.format(name))
+        cfactors = self.cumulative_factor_array(from_year, to_year)
+        return cfactors[Growfactors.NAME_INDEX[name]]
+
+    def update(self, name, year, diff):
+        """
+        Add to the factor with specified name for specified year the
+        specified diff amount.
+        """
+        if self.used:
+            msg = 'cannot update growfactors after they have been used'
+            raise ValueError(msg)
+        self._check_year(year)
+        self._matrix[year - self.first_year,
+                     Growfactors.NAME_INDEX[name]] += diff
+        self._cumulative = None
+
+    # ----- begin private methods of Growfactors class -----
+
+    def _check_year(self, year):
+        """
+        Raise ValueError if specified year is not in the factor years.
+        """
         if year < self.first_year:
             msg = 'year={} < Growfactors.first_year={}'
             raise ValueError(msg.format(year, self.first_year))
         if year > self.last_year:
             msg = 'year={} > Growfactors.last_year={}'
             raise ValueError(msg.format(year, self.last_year))
-        return self.gfdf[name][year]
 
-    def update(self, name, year, diff):
+    def _rates(self, name, firstyear, lastyear):
         """
-        Add to self.gfdf[name][year] the specified diff amount.
+        Return list of rates implied by the factor with specified name
+        for years in [firstyear, lastyear] rounded to four decimal digits.
         """
-        if self.used:
-            msg = 'cannot update growfactors after they have been used'
-            raise ValueError(msg)
-        self.gfdf[name][year] += diff
+        factors = self._matrix[firstyear - self.first_year:
+                               lastyear - self.first_year + 1,
+                               Growfactors.NAME_INDEX[name]]
+        return [round((factor - 1.0), 4) for factor in factors]
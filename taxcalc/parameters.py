@@ -2,6 +2,7 @@
 Tax-Calculator abstract base parameters class.
 """
 import os
+import copy
 import json
 import six
 import abc
@@ -10,6 +11,34 @@ import numpy as np
 from taxcalc.utils import read_egg_json
 
 
+# Process-wide cache of the dictionaries read from the DEFAULTS_FILENAME
+# files, which are copied by the _params_dict_from_json_file method, and
+# of the default parameter values expanded by the set_default_vals method
+PARAMS_DICT_CACHE = dict()
+EXPANDED_DEFAULTS_CACHE = dict()
+
+
+class DefaultParamsDict(collect.OrderedDict):
+    """
+    Dictionary returned by ParametersBase._params_dict_from_json_file,
+    which is a copy of the dictionary read from the DEFAULTS_FILENAME file
+    at the specified path (copying the data dictionary and the value list
+    of each parameter so that they can be changed in the copy).
+    """
+
+    def __init__(self, path=None, params_dict=None):
+        super(DefaultParamsDict, self).__init__()
+        self.path = path
+        if params_dict is None:
+            return
+        for name, data in params_dict.items():
+            data = collect.OrderedDict(data)
+            if isinstance(data.get('value', None), list):
+                data['value'] = [list(val) if isinstance(val, list) else val
+                                 for val in data['value']]
+            self[name] = data
+
+
 class ParametersBase(object):
     """
     Inherit from this class for Policy, Behavior, Consumption, Growdiff, and
@@ -90,6 +119,16 @@ class ParametersBase(object):
         Called by initialize method and from some subclass methods.
         """
         if hasattr(self, '_vals'):
+            cache_key = self._expanded_defaults_key()
+            expanded = EXPANDED_DEFAULTS_CACHE.get(cache_key)
+            if expanded is not None:
+                for name, arr in expanded.items():
+                    setattr(self, name, arr.copy())
+                self.set_year(self._start_year)
+                return
+            # expand the inflated parameters that use the same indexing
+            # rates together in one vectorized step per year
+            inflated = collect.OrderedDict()
             for name, data in self._vals.items():
                 if not isinstance(name, six.string_types):
                     msg = 'parameter name {} is not a string'
@@ -99,14 +138,49 @@ class ParametersBase(object):
                     cpi_inflated = data.get('cpi_inflated', False)
                     if cpi_inflated:
                         index_rates = self.indexing_rates(name)
+                        key = id(index_rates)
+                        if key not in inflated:
+                            inflated[key] = (index_rates, list(), list())
+                        inflated[key][1].append(name)
+                        inflated[key][2].append(values)
                     else:
-                        index_rates = None
-                    setattr(self, name,
-                            self._expand_array(values, inflate=cpi_inflated,
-                                               inflation_rates=index_rates,
-                                               num_years=self._num_years))
+                        setattr(self, name,
+                                self._expand_array(values, inflate=False,
+                                                   inflation_rates=None,
+                                                   num_years=self._num_years))
+            for index_rates, names, values_list in inflated.values():
+                arrays = self._expand_arrays(values_list,
+                                             inflation_rates=index_rates,
+                                             num_years=self._num_years)
+                for name, arr in zip(names, arrays):
+                    setattr(self, name, arr)
+            if cache_key is not None:
+                EXPANDED_DEFAULTS_CACHE[cache_key] = {
+                    name: getattr(self, name).copy()
+                    for name, data in self._vals.items()
+                    if data.get('value', None)}
         self.set_year(self._start_year)
 
+    def _expanded_defaults_key(self):
+        """
+        Return key of the EXPANDED_DEFAULTS_CACHE entry for the expanded
+        values of the parameters in _vals, or None if _vals does not
+        contain the default parameter values read from DEFAULTS_FILENAME.
+        The expanded values depend only on the default parameter values,
+        which are never changed, on the cpi_inflated values, which can be
+        changed by the _update method, and on the number of budget years
+        and the indexing rates.
+        """
+        if not isinstance(self._vals, DefaultParamsDict):
+            return None
+        cpi_inflated = tuple(bool(data.get('cpi_inflated', False))
+                             for data in self._vals.values())
+        rates = list()
+        for rates_list in [self.inflation_rates(), self.wage_growth_rates()]:
+            rates.append(None if rates_list is None else tuple(rates_list))
+        return (self._vals.path, cpi_inflated, self._start_year,
+                self._num_years, tuple(rates))
+
     @property
     def num_years(self):
         """
@@ -165,15 +239,67 @@ class ParametersBase(object):
             msg = 'year {} passed to set_year() must be in [{},{}] range.'
             raise ValueError(msg.format(year, self.start_year, self.end_year))
         self._current_year = year
-        year_zero_indexed = year - self._start_year
         if hasattr(self, '_vals'):
-            for name in self._vals:
-                if isinstance(name, six.string_types):
-                    arr = getattr(self, name)
-                    setattr(self, name[1:], arr[year_zero_indexed])
+            # forget the current-year parameter values for the previous
+            # current_year, which are looked up again when they are used
+            # (see the __getattr__ method)
+            year_names = self._year_names()
+            for name in year_names.intersection(self.__dict__):
+                del self.__dict__[name]
+
+    def __getattr__(self, name):
+        """
+        Return the current_year value of the parameter with the specified
+        name (that is, without the leading underscore) by indexing the
+        array containing the parameter values for all the years, and
+        remember the value until the set_year method is called.  This
+        method is called only when there is no attribute with name, so
+        the set_year method does not have to loop over all parameters.
+        """
+        if name.startswith('_') or not hasattr(self, '_vals'):
+            raise AttributeError(name)
+        if name not in self._year_names():
+            msg = '{} object has no attribute {}'
+            raise AttributeError(msg.format(type(self).__name__, name))
+        arr = getattr(self, '_' + name)
+        value = arr[self._current_year - self._start_year]
+        self.__dict__[name] = value
+        return value
+
+    def _year_names(self):
+        """
+        Return set of the names of the current_year parameter values,
+        which are the _vals names without the leading underscore.
+        """
+        year_names = self.__dict__.get('_year_names_set')
+        if year_names is None or len(year_names) != len(self._vals):
+            year_names = set(name[1:] for name in self._vals
+                             if isinstance(name, six.string_types))
+            self.__dict__['_year_names_set'] = year_names
+        return year_names
 
     # ----- begin private methods of ParametersBase class -----
 
+    def _update_copy(self):
+        """
+        Return copy of this object that can be changed by the _update
+        method (and hence by the implement_reform method) without changing
+        this object.  This is much faster than a deep copy because only the
+        parameter-value arrays, the current-year values and the data
+        dictionary of each parameter are copied; the other data, such as
+        the default value lists in _vals, are shared with this object.
+        """
+        pcopy = copy.copy(self)
+        pcopy._vals = copy.copy(self._vals)
+        for name, data in self._vals.items():
+            pcopy._vals[name] = copy.copy(data)
+            values = self.__dict__.get(name)
+            if isinstance(values, np.ndarray):
+                pcopy.__dict__[name] = values.copy()
+        for name in self._year_names().intersection(self.__dict__):
+            pcopy.__dict__[name] = copy.deepcopy(self.__dict__[name])
+        return pcopy
+
     @staticmethod
     def _revised_default_data(params, start_year, nyrs, ppo):
         """
@@ -241,15 +367,18 @@ class ParametersBase(object):
             raise NotImplementedError(msg)
         path = os.path.join(os.path.abspath(os.path.dirname(__file__)),
                             cls.DEFAULTS_FILENAME)
-        if os.path.exists(path):
-            with open(path) as pfile:
-                params_dict = json.load(pfile,
-                                        object_pairs_hook=collect.OrderedDict)
-        else:
-            # cannot call read_egg_ function in unit tests
-            params_dict = read_egg_json(
-                cls.DEFAULTS_FILENAME)  # pragma: no cover
-        return params_dict
+        params_dict = PARAMS_DICT_CACHE.get(path)
+        if params_dict is None:
+            if os.path.exists(path):
+                with open(path) as pfile:
+                    params_dict = json.load(
+                        pfile, object_pairs_hook=collect.OrderedDict)
+            else:
+                # cannot call read_egg_ function in unit tests
+                params_dict = read_egg_json(
+                    cls.DEFAULTS_FILENAME)  # pragma: no cover
+            PARAMS_DICT_CACHE[path] = params_dict
+        return DefaultParamsDict(path, params_dict)
 
     def _update(self, year_mods):
         """
@@ -423,13 +552,7 @@ class ParametersBase(object):
         -------
         expanded numpy array with dtype=np.float64
         """
-        if not isinstance(x, list) and not isinstance(x, np.ndarray):
-            msg = '_expand_array expects x to be a list or numpy array'
-            raise ValueError(msg)
-        if isinstance(x, list):
-            x = np.array(x, np.float64)
-        if np.any(np.isnan(x)):
-            raise ValueError('_expand_array expects array with no NaN values')
+        x = ParametersBase._valid_array(x)
         if len(x.shape) == 1:
             return ParametersBase._expand_1D(x, inflate, inflation_rates,
                                              num_years)
@@ -439,6 +562,58 @@ class ParametersBase(object):
         else:
             raise ValueError('_expand_array expects a 1D or 2D array')
 
+    @staticmethod
+    def _valid_array(x):
+        """
+        Private method called only within this abstract base class.
+        Return x as a numpy array after checking that x is a valid value
+        to expand.
+        """
+        if not isinstance(x, list) and not isinstance(x, np.ndarray):
+            msg = '_expand_array expects x to be a list or numpy array'
+            raise ValueError(msg)
+        if isinstance(x, list):
+            x = np.array(x, np.float64)
+        if np.any(np.isnan(x)):
+            raise ValueError('_expand_array expects array with no NaN values')
+        return x
+
+    @staticmethod
+    def _expand_arrays(xs, inflation_rates, num_years):
+        """
+        Private method called only from set_default_vals method.
+        Return list containing the result of calling _expand_array with
+        inflate=True for each x in the xs list, where the rows added to
+        all the x values for a year are computed in one vectorized step.
+        """
+        xs = [ParametersBase._valid_array(x) for x in xs]
+        cols = list()  # column slices of the x values in the ans matrix
+        num_cols = 0
+        for x in xs:
+            ncols = 1 if len(x.shape) == 1 else x.shape[1]
+            cols.append(slice(num_cols, num_cols + ncols))
+            num_cols += ncols
+        ans = np.zeros((num_years, num_cols), dtype=np.float64)
+        num_rows = np.zeros(num_cols, dtype=np.int64)
+        for x, col in zip(xs, cols):
+            nrows = min(x.shape[0], num_years)
+            ans[:nrows, col] = x[:nrows].reshape(nrows, -1)
+            num_rows[col] = x.shape[0]
+        for i in range(1, num_years):
+            icols = np.flatnonzero(num_rows <= i)
+            if icols.size > 0:
+                ans[i, icols] = _round_to_cents(
+                    ans[i - 1, icols] * (1. + inflation_rates[i - 1]))
+        expanded = list()
+        for x, col in zip(xs, cols):
+            if x.shape[0] >= num_years:
+                expanded.append(x)
+            elif len(x.shape) == 1:
+                expanded.append(ans[:, col.start].copy())
+            else:
+                expanded.append(ans[:, col].copy())
+        return expanded
+
     @staticmethod
     def _expand_1D(x, inflate, inflation_rates, num_years):
         """
@@ -452,20 +627,9 @@ class ParametersBase(object):
         if len(x) >= num_years:
             return x
         else:
-            ans = np.zeros(num_years, dtype=np.float64)
-            ans[:len(x)] = x
-            if inflate:
-                extra = []
-                cur = x[-1]
-                for i in range(0, num_years - len(x)):
-                    cur *= (1. + inflation_rates[i + len(x) - 1])
-                    cur = round(cur, 2) if cur < 9e99 else 9e99
-                    extra.append(cur)
-            else:
-                extra = [float(x[-1]) for i in
-                         range(1, num_years - len(x) + 1)]
-            ans[len(x):] = extra
-            return ans
+            ans = ParametersBase._expand_2D(x.reshape(len(x), 1), inflate,
+                                            inflation_rates, num_years)
+            return ans.reshape(num_years)
 
     @staticmethod
     def _expand_2D(x, inflate, inflation_rates, num_years):
@@ -475,6 +639,9 @@ class ParametersBase(object):
         For 2D arrays, we expand out the number of rows until we have num_years
         number of rows. For each expanded row, we inflate using the given
         inflation rates list.
+        Each expanded row is computed from the previous row in one vectorized
+        step, with each inflated value rounded to the nearest cent exactly as
+        the round(value, 2) builtin function does (see _round_to_cents).
         """
         if not isinstance(x, np.ndarray):
             raise ValueError('_expand_2D expects x to be a numpy array')
@@ -483,15 +650,12 @@ class ParametersBase(object):
         else:
             ans = np.zeros((num_years, x.shape[1]), dtype=np.float64)
             ans[:len(x), :] = x
-            for i in range(x.shape[0], ans.shape[0]):
-                for j in range(ans.shape[1]):
-                    if inflate:
-                        cur = (ans[i - 1, j] *
-                               (1. + inflation_rates[i - 1]))
-                        cur = round(cur, 2) if cur < 9e99 else 9e99
-                        ans[i, j] = cur
-                    else:
-                        ans[i, j] = ans[i - 1, j]
+            if inflate:
+                for i in range(x.shape[0], ans.shape[0]):
+                    ans[i, :] = _round_to_cents(
+                        ans[i - 1, :] * (1. + inflation_rates[i - 1]))
+            else:
+                ans[len(x):, :] = x[-1, :]
             return ans
 
     def _indexing_rates_for_update(self, param_name,
@@ -509,3 +673,27 @@ class ParametersBase(object):
             return expanded_rates
         else:
             return None
+
+
+def _round_to_cents(values):
+    """
+    Return array containing, for each element of the specified values
+    array, round(value, 2) if value < 9e99 else 9e99, where the array is
+    rounded using vectorized operations.  The vectorized rounding of a
+    value to the nearest cent can differ from the correctly-rounded result
+    of the round builtin function only when the value times 100 is very
+    close to a half-cent (because of floating-point error in the scaling)
+    or is too large to have a fractional part, so those few values are
+    rounded using the round builtin function.
+    """
+    scaled = values * 100.
+    ans = np.rint(scaled) / 100.
+    abs_scaled = np.abs(scaled)
+    inexact = np.logical_and(
+        np.logical_or(
+            np.abs(scaled - np.floor(scaled) - 0.5) <= 5e-16 * abs_scaled,
+            np.logical_not(abs_scaled < 2.**52)),
+        values < 9e99)
+    for idx in np.flatnonzero(inexact):
+        ans.flat[idx] = round(values.flat[idx], 2)
+    return np.where(values < 9e99, ans, 9e99)
@@ -12,6 +12,11 @@ from taxcalc.growfactors import Growfactors
 from taxcalc.growdiff import Growdiff
 
 
+# Process-wide cache of current-law Policy objects used to validate reform
+# parameter values, keyed by the years and indexing rates of the objects
+CURRENT_LAW_POLICY_CACHE = dict()
+
+
 class Policy(ParametersBase):
 
     """
@@ -372,11 +377,10 @@ class Policy(ParametersBase):
         """
         Check values of parameters in specified parameter_set using
         range information from the current_law_policy.json file.
+        The out-of-range values of each parameter are found using
+        array comparisons, so messages are constructed only for
+        the out-of-range values.
         """
-        # pylint: disable=too-many-locals
-        # pylint: disable=too-many-branches
-        # pylint: disable=too-many-nested-blocks
-        clp = self.current_law_version()
         parameters = sorted(parameters_set)
         syr = Policy.JSON_START_YEAR
         for pname in parameters:
@@ -386,48 +390,57 @@ class Policy(ParametersBase):
             for vop, vval in self._vals[pname]['range'].items():
                 if isinstance(vval, six.string_types):
                     if vval == 'default':
-                        vvalue = getattr(clp, pname)
+                        vvalue = self._current_law_values(pname)
                     else:
                         vvalue = getattr(self, vval)
                 else:
                     vvalue = np.full(pvalue.shape, vval)
                 assert pvalue.shape == vvalue.shape
                 assert len(pvalue.shape) <= 2
-                if len(pvalue.shape) == 2:
-                    scalar = False  # parameter value is a list
+                if vop == 'min':
+                    out_of_range = pvalue < vvalue
+                    msg = '{} {} value {} < min value {}'
+                    extra = self._vals[pname]['out_of_range_minmsg']
+                elif vop == 'max':
+                    out_of_range = pvalue > vvalue
+                    msg = '{} {} value {} > max value {}'
+                    extra = self._vals[pname]['out_of_range_maxmsg']
                 else:
-                    scalar = True  # parameter value is a scalar
-                for idx in np.ndindex(pvalue.shape):
-                    out_of_range = False
-                    if vop == 'min' and pvalue[idx] < vvalue[idx]:
-                        out_of_range = True
-                        msg = '{} {} value {} < min value {}'
-                        extra = self._vals[pname]['out_of_range_minmsg']
-                        if len(extra) > 0:
-                            msg += ' {}'.format(extra)
-                    if vop == 'max' and pvalue[idx] > vvalue[idx]:
-                        out_of_range = True
-                        msg = '{} {} value {} > max value {}'
-                        extra = self._vals[pname]['out_of_range_maxmsg']
+                    continue
+                if not out_of_range.any():
+                    continue
+                if len(extra) > 0:
+                    msg += ' {}'.format(extra)
+                action = self._vals[pname]['out_of_range_action']
+                for idx in np.argwhere(out_of_range):
+                    idx = tuple(idx)
+                    if len(pvalue.shape) == 2:
+                        name = '{}_{}'.format(pname, idx[1])
                         if len(extra) > 0:
-                            msg += ' {}'.format(extra)
-                    if out_of_range:
-                        action = self._vals[pname]['out_of_range_action']
-                        if scalar:
-                            name = pname
+                            idx_msg = msg + '_{}'.format(idx[1])
                         else:
-                            name = '{}_{}'.format(pname, idx[1])
-                            if len(extra) > 0:
-                                msg += '_{}'.format(idx[1])
-                        if action == 'warn':
-                            self.reform_warnings += (
-                                'WARNING: ' + msg.format(idx[0] + syr, name,
-                                                         pvalue[idx],
-                                                         vvalue[idx]) + '\n'
-                            )
-                        if action == 'stop':
-                            self.reform_errors += (
-                                'ERROR: ' + msg.format(idx[0] + syr, name,
-                                                       pvalue[idx],
-                                                       vvalue[idx]) + '\n'
-                            )
+                            idx_msg = msg
+                    else:
+                        name = pname
+                        idx_msg = msg
+                    idx_msg = idx_msg.format(idx[0] + syr, name,
+                                             pvalue[idx], vvalue[idx])
+                    if action == 'warn':
+                        self.reform_warnings += 'WARNING: ' + idx_msg + '\n'
+                    if action == 'stop':
+                        self.reform_errors += 'ERROR: ' + idx_msg + '\n'
+
+    def _current_law_values(self, pname):
+        """
+        Return array containing the current-law values of the parameter
+        with pname in each of the years of this Policy object, which are
+        obtained from a cached current-law Policy object with the same
+        years and indexing rates.
+        """
+        key = (self.start_year, self.num_years,
+               tuple(self._inflation_rates), tuple(self._wage_growth_rates))
+        clp = CURRENT_LAW_POLICY_CACHE.get(key)
+        if clp is None:
+            clp = self.current_law_version()
+            CURRENT_LAW_POLICY_CACHE[key] = clp
+        return getattr(clp, pname)
@@ -7,6 +7,7 @@ Tax-Calculator tax-filing-unit Records class.
 
 import os
 import json
+import pickle
 import six
 import numpy as np
 import pandas as pd
@@ -18,6 +19,23 @@ PUFCSV_YEAR = 2009
 CPSCSV_YEAR = 2014
 
 
+# shared read-only arrays of zeros keyed by length and type
+ZERO_ARRAYS = dict()
+
+
+def _zero_array(dim, dtype):
+    """
+    Return shared read-only array of dim zeros of the specified type.
+    """
+    key = (dim, dtype)
+    values = ZERO_ARRAYS.get(key)
+    if values is None:
+        values = np.zeros(dim, dtype=dtype)
+        values.flags.writeable = False
+        ZERO_ARRAYS[key] = values
+    return values
+
+
 class Records(object):
     """
     Constructor for the tax-filing-unit Records class.
@@ -25,7 +43,11 @@ class Records(object):
     Parameters
     ----------
     data: string or Pandas DataFrame
-        string describes CSV file in which records data reside;
+        string describes CSV file in which records data reside,
+        or NPZ file (whose name ends with Records.NPZ_SUFFIX) written
+        by the Records.write_npz method,
+        or directory of memory-mapped column files written by the
+        Records.write_columns method;
         DataFrame already contains records data;
         default value is the string 'puf.csv'
         For details on how to use your own data with the Tax-Calculator,
@@ -63,12 +85,47 @@ class Records(object):
         look at the test_Calculator_using_nonstd_input()
         function in the taxcalc/tests/test_calculate.py file.
 
+    compact_dtypes: boolean
+        specifies whether or not the variables that have a compact_type
+        in the records_variables.json file are stored using that type,
+        which is a smaller integer type for flags and counts and float32
+        for some monetary variables, in order to reduce memory use;
+        default value is false.
+        Note that storing monetary variables as float32 rounds their
+        values to about seven significant digits, so tax results can
+        differ from those computed without compact types: the documented
+        tolerance is a relative difference of less than 1e-7 in weighted
+        totals and an absolute difference of less than one dollar in each
+        filing unit's tax liabilities.
+        Note also that numba compiles a separate version of each
+        tax-calculation function for the compact types, so the first
+        calc_all() call for Records objects with compact types takes
+        about as long as the first call without them (roughly 20 seconds)
+        even when a process has already used Records objects without
+        compact types.
+
+    block_storage: boolean
+        specifies whether or not the arrays of the variables that were
+        read and of all the calculated variables are stored as the rows of
+        one two-dimensional block for each array type (for example, one
+        block of float64 values and one block of int64 values), so that
+        whole-record operations, such as copying, pickling, taking and
+        restoring snapshots, zeroing out calculated variables, and
+        exporting variables with the to_dataframe method, are done with a
+        single operation on each block; default value is false.
+        Note that the array of each variable is a view of its block row,
+        so replacing a variable's array by assigning another array to the
+        variable is allowed, but the assigned array's values are copied
+        into the block row, and the variable's array again becomes the
+        view of the block row, at the next whole-record operation.
+
     Raises
     ------
     ValueError:
         if data is not the appropriate type.
         if taxpayer and spouse variables do not add up to filing-unit total.
         if dividends is less than qualified dividends.
+        if integer variable values do not fit in their compact type.
         if gfactors is not None or a Growfactors class instance.
         if start_year is not an integer.
         if files cannot be found.
@@ -106,6 +163,9 @@ class Records(object):
     CPS_WEIGHTS_FILENAME = 'cps_weights.csv.gz'
     CPS_RATIOS_FILENAME = None
     VAR_INFO_FILENAME = 'records_variables.json'
+    SHARED_STATE_FILENAME = 'records.pkl'
+    NPZ_SUFFIX = '.npz'
+    COLUMNS_FILENAME = 'records_columns.json'
 
     def __init__(self,
                  data='puf.csv',
@@ -113,11 +173,14 @@ class Records(object):
                  gfactors=Growfactors(),
                  weights=PUF_WEIGHTS_FILENAME,
                  adjust_ratios=PUF_RATIOS_FILENAME,
-                 start_year=PUFCSV_YEAR):
+                 start_year=PUFCSV_YEAR,
+                 compact_dtypes=False,
+                 block_storage=False):
         # pylint: disable=too-many-arguments
         self._data_year = start_year
         # read specified data
-        self._read_data(data, exact_calculations)
+        self._read_data(data, exact_calculations, compact_dtypes,
+                        block_storage)
         # check that three sets of split-earnings variables have valid values
         msg = 'expression "{0} == {0}p + {0}s" is not true for every record'
         tol = 0.020001  # handles "%.2f" rounding errors
@@ -158,6 +221,7 @@ class Records(object):
         # specify current_year and FLPDYR values
         if isinstance(start_year, int):
             self._current_year = start_year
+            self.make_writable(['FLPDYR'])
             self.FLPDYR.fill(start_year)
         else:
             msg = 'start_year is not an integer'
@@ -173,7 +237,9 @@ class Records(object):
     @staticmethod
     def cps_constructor(data=None,
                         exact_calculations=False,
-                        growfactors=Growfactors()):
+                        growfactors=Growfactors(),
+                        compact_dtypes=False,
+                        block_storage=False):
         """
         Static method returns a Records object instantiated with CPS
         input data.  This works in a analogous way to Records(), which
@@ -191,7 +257,127 @@ class Records(object):
                        gfactors=growfactors,
                        weights=Records.CPS_WEIGHTS_FILENAME,
                        adjust_ratios=Records.CPS_RATIOS_FILENAME,
-                       start_year=CPSCSV_YEAR)
+                       start_year=CPSCSV_YEAR,
+                       compact_dtypes=compact_dtypes,
+                       block_storage=block_storage)
+
+    @staticmethod
+    def read_chunks(data='puf.csv',
+                    chunk_size=100000,
+                    exact_calculations=False,
+                    gfactors=Growfactors(),
+                    weights=PUF_WEIGHTS_FILENAME,
+                    adjust_ratios=PUF_RATIOS_FILENAME,
+                    start_year=PUFCSV_YEAR,
+                    compact_dtypes=False,
+                    block_storage=False):
+        """
+        Static method returns a generator that yields Records objects
+        each containing the next chunk of (at most) chunk_size filing
+        units in the specified data, so that data too large to fit in
+        memory can be processed one chunk at a time.  The other arguments
+        have the same meaning as the Records class constructor arguments
+        and, when data is a CSV file, it is read one chunk at a time.
+        The sample weights of the filing units in each chunk are the same
+        as those in a Records object constructed with all the data.
+        """
+        # pylint: disable=too-many-arguments
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be a positive integer')
+        # read (and possibly scale) sample weights for all the data
+        if isinstance(weights, six.string_types):
+            weights_path = os.path.join(Records.CUR_PATH, weights)
+            if os.path.isfile(weights_path):
+                weights = pd.read_csv(weights_path)
+            else:
+                # cannot call read_egg_ function in unit tests
+                weights = read_egg_csv(
+                    os.path.basename(weights_path))  # pragma: no cover
+        if isinstance(data, six.string_types) and not os.path.isfile(data):
+            # cannot call read_egg_ function in unit tests
+            data = read_egg_csv(data)  # pragma: no cover
+        if isinstance(data, pd.DataFrame):
+            index = data.index
+            chunks = (data.iloc[start:(start + chunk_size)]
+                      for start in range(0, len(data), chunk_size))
+        elif isinstance(data, six.string_types):
+            index = None
+            chunks = pd.read_csv(data, chunksize=chunk_size)
+        else:
+            msg = 'data is neither a string nor a Pandas DataFrame'
+            raise ValueError(msg)
+        if isinstance(weights, pd.DataFrame):
+            weights = weights.astype(np.float64)
+            if index is None:
+                num_rows = 0
+                for chunk in pd.read_csv(data, usecols=[0],
+                                         chunksize=chunk_size):
+                    num_rows += len(chunk)
+                index = pd.RangeIndex(num_rows)
+            if len(index) != len(weights):
+                # scale-up sub-sample weights as in Records constructor
+                sum_full_weights = weights.sum()
+                weights = weights.iloc[index]
+                weights = weights * (sum_full_weights / weights.sum())
+            weights.index = index
+        # construct a Records object for each chunk of data
+        for chunk in chunks:
+            if isinstance(weights, pd.DataFrame):
+                chunk_weights = weights.loc[chunk.index]
+            else:
+                chunk_weights = weights
+            yield Records(data=chunk,
+                          exact_calculations=exact_calculations,
+                          gfactors=gfactors,
+                          weights=chunk_weights,
+                          adjust_ratios=adjust_ratios,
+                          start_year=start_year,
+                          compact_dtypes=compact_dtypes,
+                          block_storage=block_storage)
+
+    @staticmethod
+    def write_npz(data, npz_filename):
+        """
+        Static method that writes to the specified NPZ file the array of
+        each Records.USABLE_READ_VARS variable in the specified data,
+        which is the name of a CSV file or a Pandas DataFrame, converted
+        to the type specified in the records_variables.json file.  Other
+        variables in data are not written.  Using the NPZ file as the
+        data argument of the Records constructor (or the cps_constructor
+        method) avoids the parsing of CSV text and the conversion of
+        variable types, and row i of the NPZ data corresponds to row i
+        of the sample weights.
+        """
+        if not npz_filename.endswith(Records.NPZ_SUFFIX):
+            msg = 'npz_filename={} does not end with {}'
+            raise ValueError(msg.format(npz_filename, Records.NPZ_SUFFIX))
+        np.savez(npz_filename, **Records._input_arrays(data))
+
+    @staticmethod
+    def write_columns(data, dirname):
+        """
+        Static method that writes to the specified directory, which is
+        created if it does not exist, one NPY file containing the array of
+        each Records.USABLE_READ_VARS variable in the specified data, which
+        is the name of a CSV file or a Pandas DataFrame, converted to the
+        type specified in the records_variables.json file, along with a
+        Records.COLUMNS_FILENAME file listing the variables written.  Other
+        variables in data are not written.  Using the directory as the data
+        argument of the Records constructor (or the cps_constructor method)
+        memory-maps the NPY files, so the pages of input variables that are
+        never changed are read only when used and are shared through the
+        operating system's page cache by all the processes that use the
+        directory.  Row i of the data corresponds to row i of the sample
+        weights.
+        """
+        arrays = Records._input_arrays(data)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        for varname, values in arrays.items():
+            np.save(os.path.join(dirname, varname + '.npy'), values)
+        with open(os.path.join(dirname, Records.COLUMNS_FILENAME),
+                  'w') as cfile:
+            json.dump(sorted(arrays.keys()), cfile)
 
     @property
     def data_year(self):
@@ -212,13 +398,30 @@ class Records(object):
         Add one to current year.
         Also, does extrapolation, reweighting, adjusting for new current year.
         """
-        self._current_year += 1
-        # apply variable extrapolation growfactors
-        if self.gfactors is not None:
-            self._blowup(self.current_year)
-        # apply variable adjustment ratios
-        self._adjust(self.current_year)
+        self.age_to(self.current_year + 1)
+
+    def age_to(self, year):
+        """
+        Advance current year to specified year, doing the extrapolation,
+        reweighting and adjusting for each intervening year.
+        The results are exactly the same as those produced by calling
+        increment_year once for each intervening year, because each
+        variable is still multiplied in place by the grow factor (and
+        adjustment ratio) for each intervening year in turn, using one
+        whole-array multiplication per year.  What is saved is the
+        per-year overhead: the grow factors for all the intervening years
+        are looked up at once, and the sample weights are set only for
+        the specified year.
+        """
+        if year < self.current_year:
+            msg = 'year={} is less than current_year={}'
+            raise ValueError(msg.format(year, self.current_year))
+        if year == self.current_year:
+            return
+        # apply variable extrapolation growfactors and adjustment ratios
+        self._grow(range(self.current_year + 1, year + 1), adjust=True)
         # specify current-year sample weights
+        self._current_year = year
         if self.WT is not None:
             wt_colname = 'WT{}'.format(self.current_year)
             if wt_colname in self.WT.columns:
@@ -231,8 +434,205 @@ class Records(object):
         are skipped.
         """
         self._current_year = new_current_year
+        self.make_writable(['FLPDYR'])
         self.FLPDYR.fill(new_current_year)
 
+    def make_writable(self, varnames):
+        """
+        Replace the array of each of the specified variables that is an
+        unread input variable, whose array is a shared read-only array of
+        zeros, with a private array of zeros, so that all the specified
+        variables can be changed in place.
+        """
+        for varname in varnames:
+            if varname not in self.__dict__:
+                setattr(self, varname,
+                        np.zeros(self.dim, dtype=self._var_dtype(varname)))
+
+    def snapshot(self, varnames):
+        """
+        Return a snapshot of the current values of only the specified
+        variables, which can be used by the restore method to undo any
+        later changes to those variables, including changes made in
+        place and the replacement of a variable array by another array.
+        """
+        snap = dict()
+        if self.__dict__.get('_blocks') is not None:
+            # copy the rows of the variables stored in each block at once
+            self._sync_blocks()
+            varnames = set(varnames)
+            for dtype_name, block_names in self._block_names.items():
+                rows = [row for row, varname in enumerate(block_names)
+                        if varname in varnames]
+                block_values = self._blocks[dtype_name][rows]
+                for values, row in zip(block_values, rows):
+                    snap[block_names[row]] = values
+            varnames -= set(snap)
+        for varname in varnames:
+            values = self.__dict__.get(varname)
+            if values is None:
+                # variable not yet allocated, so snapshot shared zeros
+                values = _zero_array(self.dim, self._var_dtype(varname))
+            else:
+                values = np.array(values, copy=True)
+            snap[varname] = values
+        return snap
+
+    def restore(self, snapshot):
+        """
+        Restore the values of the variables in the specified snapshot,
+        which was returned by the snapshot method.  The snapshot can be
+        used to restore the same values again.
+        """
+        if self.__dict__.get('_blocks') is not None:
+            self._sync_blocks()
+        for varname, values in snapshot.items():
+            if values is ZERO_ARRAYS.get((values.size, values.dtype)):
+                # variable was not allocated when the snapshot was taken
+                self.__dict__.pop(varname, None)
+                continue
+            var = self.__dict__.get(varname)
+            if (isinstance(var, np.ndarray) and var.shape == values.shape and
+                    var.flags.writeable):
+                np.copyto(var, values)
+            else:
+                setattr(self, varname, values.copy())
+
+    def to_dataframe(self, varnames=None):
+        """
+        Return Pandas DataFrame containing one column for each of the
+        specified variables in the specified order, where the default is
+        all the variables in the Records.USABLE_READ_VARS and
+        Records.CALCULATED_VARS sets in an unspecified order.  When block
+        storage is used, the values of the variables stored in each block
+        are copied in one operation.
+        """
+        blocks = self.__dict__.get('_blocks')
+        if varnames is None:
+            varnames = list()
+            if blocks is not None:
+                for block_names in self._block_names.values():
+                    varnames.extend(block_names)
+            varnames.extend(sorted((Records.USABLE_READ_VARS |
+                                    Records.CALCULATED_VARS) - set(varnames)))
+        else:
+            varnames = list(varnames)
+        frames = list()
+        others = varnames
+        if blocks is not None:
+            self._sync_blocks()
+            for dtype_name, block in blocks.items():
+                names = [varname for varname in varnames
+                         if self._block_rows.get(varname,
+                                                 (None,))[0] == dtype_name]
+                if names:
+                    rows = [self._block_rows[varname][1] for varname in names]
+                    frames.append(pd.DataFrame(block[rows].T, columns=names,
+                                               copy=False))
+            others = [varname for varname in varnames
+                      if varname not in self._block_rows]
+        if others or not frames:
+            frames.append(pd.DataFrame(
+                {varname: np.asarray(getattr(self, varname))
+                 for varname in others},
+                index=pd.RangeIndex(self.dim), columns=others))
+        if len(frames) == 1:
+            dframe = frames[0]
+        else:
+            dframe = pd.concat(frames, axis=1, copy=False)
+        if list(dframe.columns) != varnames:
+            dframe = dframe[varnames]
+        return dframe
+
+    def share_columns(self, dirname):
+        """
+        Write the variable arrays of this Records object to memory-mapped
+        files in the specified existing directory and replace the arrays
+        with copy-on-write views of those files, so that other processes
+        can attach to the same data by calling Records.attach_shared with
+        the same dirname without reading or unpickling the data.  The
+        arrays of the variables changed by the tax-calculation functions
+        (that is, the Records.CHANGING_CALCULATED_VARS) are not written,
+        so each attached Records object has its own arrays of these
+        variables.  Changes made in place to the memory-mapped arrays by
+        one process are not seen by the other processes.
+        When block storage is used, each block is written to a single
+        memory-mapped file, including the rows of the changing calculated
+        variables, which each process changes in its own copy-on-write
+        pages of the file.
+        """
+        if not os.path.isdir(dirname):
+            msg = 'dirname={} is not an existing directory'
+            raise ValueError(msg.format(dirname))
+        shared_vars = Records.USABLE_READ_VARS | Records.CALCULATED_VARS
+        shared_vars -= Records.CHANGING_CALCULATED_VARS
+        shared_vars &= set(self.__dict__)
+        if self.__dict__.get('_blocks') is not None:
+            self._sync_blocks()
+            for dtype_name, block in self._blocks.items():
+                path = os.path.join(dirname, 'block_{}.npy'.format(dtype_name))
+                np.save(path, block)
+                self._blocks[dtype_name] = np.load(path, mmap_mode='c')
+            self._bind_block_views()
+            shared_vars -= set(self._block_rows)
+        for varname in shared_vars:
+            path = os.path.join(dirname, varname + '.npy')
+            np.save(path, np.asarray(getattr(self, varname)))
+            setattr(self, varname, np.load(path, mmap_mode='c'))
+        # write sample weights
+        wt_path = os.path.join(dirname, 'WT.npy')
+        np.save(wt_path, self.WT.values.astype(np.float64))
+        # write all other Records object attributes
+        state = dict()
+        for name, value in self.__dict__.items():
+            if (name in shared_vars or name == 'WT' or
+                    name in Records.CHANGING_CALCULATED_VARS or
+                    name in self.__dict__.get('_block_rows', ()) or
+                    name == '_block_views'):
+                continue
+            state[name] = value
+        if self.__dict__.get('_blocks') is not None:
+            state['_blocks'] = dict.fromkeys(self._blocks)
+        state['WT_columns'] = list(self.WT.columns)
+        with open(os.path.join(dirname, Records.SHARED_STATE_FILENAME),
+                  'wb') as sfile:
+            pickle.dump(state, sfile, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def attach_shared(dirname):
+        """
+        Static method returns a Records object whose variable arrays are
+        copy-on-write views of the memory-mapped files written by the
+        share_columns method to the specified directory, except for the
+        arrays of the Records.CHANGING_CALCULATED_VARS, which are zeros
+        allocated when first used unless block storage is used.
+        """
+        state_path = os.path.join(dirname, Records.SHARED_STATE_FILENAME)
+        if not os.path.isfile(state_path):
+            msg = 'dirname={} does not contain shared Records data'
+            raise ValueError(msg.format(dirname))
+        if Records.INTEGER_VARS is None:
+            Records.read_var_info()
+        with open(state_path, 'rb') as sfile:
+            state = pickle.load(sfile)
+        recs = Records.__new__(Records)
+        wt_columns = state.pop('WT_columns')
+        recs.__dict__.update(state)
+        if state.get('_blocks') is not None:
+            for dtype_name in state['_blocks']:
+                path = os.path.join(dirname, 'block_{}.npy'.format(dtype_name))
+                recs._blocks[dtype_name] = np.load(path, mmap_mode='c')
+            recs._bind_block_views()
+        shared_vars = Records.USABLE_READ_VARS | Records.CALCULATED_VARS
+        shared_vars -= Records.CHANGING_CALCULATED_VARS
+        for varname in shared_vars:
+            path = os.path.join(dirname, varname + '.npy')
+            if os.path.isfile(path):
+                setattr(recs, varname, np.load(path, mmap_mode='c'))
+        wt_values = np.load(os.path.join(dirname, 'WT.npy'), mmap_mode='c')
+        recs.WT = pd.DataFrame(wt_values, columns=wt_columns, copy=False)
+        return recs
+
     @staticmethod
     def read_var_info():
         """
@@ -266,6 +666,20 @@ class Records(object):
                                    FIXED_CALCULATED_VARS)
         Records.CHANGING_CALCULATED_VARS = FLOAT_CALCULATED_VARS
         Records.INTEGER_VARS = Records.INTEGER_READ_VARS | INT_CALCULATED_VARS
+        Records.COMPACT_TYPES = dict()
+        for iotype in ['read', 'calc']:
+            for varname, varinfo in vardict[iotype].items():
+                if 'compact_type' in varinfo:
+                    Records.COMPACT_TYPES[varname] = np.dtype(
+                        varinfo['compact_type'])
+        Records.GROWFACTOR_VARS = dict()
+        Records.SIGNED_GROWFACTOR_VARS = dict()
+        for varname, varinfo in vardict['read'].items():
+            gfname = varinfo.get('growfactor')
+            if isinstance(gfname, list):
+                Records.SIGNED_GROWFACTOR_VARS[varname] = tuple(gfname)
+            elif gfname is not None:
+                Records.GROWFACTOR_VARS[varname] = gfname
         return vardict
 
     # specify various sets of variable names
@@ -275,168 +689,249 @@ class Records(object):
     CALCULATED_VARS = None
     CHANGING_CALCULATED_VARS = None
     INTEGER_VARS = None
+    COMPACT_TYPES = None
+
+    # name of the grow factor used to extrapolate each variable, and names
+    # of the grow factors applied to each signed variable's non-negative
+    # values and to its negative values, as specified by the growfactor
+    # field in the records_variables.json file
+    GROWFACTOR_VARS = None
+    SIGNED_GROWFACTOR_VARS = None
+
+    def __getattr__(self, name):
+        """
+        Return the array of a variable that is not an attribute of this
+        Records object, which is a shared read-only array of zeros for an
+        unread input variable and a new array of zeros, which becomes an
+        attribute, for a calculated variable.
+        """
+        if (name.startswith('_') or 'dim' not in self.__dict__ or
+                Records.INTEGER_VARS is None):
+            raise AttributeError(name)
+        if name in Records.CALCULATED_VARS:
+            values = np.zeros(self.dim, dtype=self._var_dtype(name))
+            self.__dict__[name] = values
+            return values
+        if name in Records.USABLE_READ_VARS:
+            return _zero_array(self.dim, self._var_dtype(name))
+        msg = '{!r} object has no attribute {!r}'
+        raise AttributeError(msg.format(type(self).__name__, name))
+
+    def __getstate__(self):
+        """
+        Return the state of this Records object used when it is pickled
+        or copied, which does not include the block-row views of the
+        variables stored in blocks because they are made again from the
+        blocks by the __setstate__ method.
+        """
+        if self.__dict__.get('_blocks') is None:
+            return self.__dict__
+        self._sync_blocks()
+        state = self.__dict__.copy()
+        for varname in self._block_views:
+            del state[varname]
+        del state['_block_views']
+        return state
+
+    def __setstate__(self, state):
+        """
+        Set the state of this Records object when it is unpickled or
+        copied, using the state returned by the __getstate__ method.
+        """
+        self.__dict__.update(state)
+        if state.get('_blocks') is not None:
+            self._bind_block_views()
 
     # ----- begin private methods of Records class -----
 
+    def _var_dtype(self, varname):
+        """
+        Return type of the array of the specified variable.
+        """
+        if (self.__dict__.get('_compact_dtypes') and
+                varname in Records.COMPACT_TYPES):
+            return Records.COMPACT_TYPES[varname]
+        if varname in Records.INTEGER_VARS:
+            return np.dtype(np.int64)
+        return np.dtype(np.float64)
+
     def _blowup(self, year):
         """
         Apply to variables the grow factors for specified calendar year.
         """
-        # pylint: disable=too-many-locals,too-many-statements
-        AWAGE = self.gfactors.factor_value('AWAGE', year)
-        AINTS = self.gfactors.factor_value('AINTS', year)
-        ADIVS = self.gfactors.factor_value('ADIVS', year)
-        ATXPY = self.gfactors.factor_value('ATXPY', year)
-        ASCHCI = self.gfactors.factor_value('ASCHCI', year)
-        ASCHCL = self.gfactors.factor_value('ASCHCL', year)
-        ACGNS = self.gfactors.factor_value('ACGNS', year)
-        ASCHEI = self.gfactors.factor_value('ASCHEI', year)
-        ASCHEL = self.gfactors.factor_value('ASCHEL', year)
-        ASCHF = self.gfactors.factor_value('ASCHF', year)
-        AUCOMP = self.gfactors.factor_value('AUCOMP', year)
-        ASOCSEC = self.gfactors.factor_value('ASOCSEC', year)
-        ACPIM = self.gfactors.factor_value('ACPIM', year)
-        ABOOK = self.gfactors.factor_value('ABOOK', year)
-        AIPD = self.gfactors.factor_value('AIPD', year)
-        self.e00200 *= AWAGE
-        self.e00200p *= AWAGE
-        self.e00200s *= AWAGE
-        self.e00300 *= AINTS
-        self.e00400 *= AINTS
-        self.e00600 *= ADIVS
-        self.e00650 *= ADIVS
-        self.e00700 *= ATXPY
-        self.e00800 *= ATXPY
-        self.e00900[:] = np.where(self.e00900 >= 0,
-                                  self.e00900 * ASCHCI,
-                                  self.e00900 * ASCHCL)
-        self.e00900s[:] = np.where(self.e00900s >= 0,
-                                   self.e00900s * ASCHCI,
-                                   self.e00900s * ASCHCL)
-        self.e00900p[:] = np.where(self.e00900p >= 0,
-                                   self.e00900p * ASCHCI,
-                                   self.e00900p * ASCHCL)
-        self.e01100 *= ACGNS
-        self.e01200 *= ACGNS
-        self.e01400 *= ATXPY
-        self.e01500 *= ATXPY
-        self.e01700 *= ATXPY
-        self.e02000[:] = np.where(self.e02000 >= 0,
-                                  self.e02000 * ASCHEI,
-                                  self.e02000 * ASCHEL)
-        self.e02100 *= ASCHF
-        self.e02100p *= ASCHF
-        self.e02100s *= ASCHF
-        self.e02300 *= AUCOMP
-        self.e02400 *= ASOCSEC
-        self.e03150 *= ATXPY
-        self.e03210 *= ATXPY
-        self.e03220 *= ATXPY
-        self.e03230 *= ATXPY
-        self.e03270 *= ACPIM
-        self.e03240 *= ATXPY
-        self.e03290 *= ACPIM
-        self.e03300 *= ATXPY
-        self.e03400 *= ATXPY
-        self.e03500 *= ATXPY
-        self.e07240 *= ATXPY
-        self.e07260 *= ATXPY
-        self.e07300 *= ABOOK
-        self.e07400 *= ABOOK
-        self.p08000 *= ATXPY
-        self.e09700 *= ATXPY
-        self.e09800 *= ATXPY
-        self.e09900 *= ATXPY
-        self.e11200 *= ATXPY
-        # ITEMIZED DEDUCTIONS
-        self.e17500 *= ACPIM
-        self.e18400 *= ATXPY
-        self.e18500 *= ATXPY
-        self.e19200 *= AIPD
-        self.e19800 *= ATXPY
-        self.e20100 *= ATXPY
-        self.e20400 *= ATXPY
-        self.g20500 *= ATXPY
-        # CAPITAL GAINS
-        self.p22250 *= ACGNS
-        self.p23250 *= ACGNS
-        self.e24515 *= ACGNS
-        self.e24518 *= ACGNS
-        # SCHEDULE E
-        self.p25470 *= ASCHEI
-        self.e26270 *= ASCHEI
-        self.e27200 *= ASCHEI
-        self.k1bx14p *= ASCHEI
-        self.k1bx14s *= ASCHEI
-        # MISCELLANOUS SCHEDULES
-        self.e07600 *= ATXPY
-        self.e32800 *= ATXPY
-        self.e58990 *= ATXPY
-        self.e62900 *= ATXPY
-        self.e87530 *= ATXPY
-        self.p87521 *= ATXPY
-        self.cmbtp *= ATXPY
-
-    def _adjust(self, year):
-        """
-        Adjust value of income variables to match SOI distributions
-        Note: adjustment must leave variables as numpy.ndarray type
-        """
-        if len(self.ADJ) != 0:
+        self._grow([year], adjust=False)
+
+    def _grow(self, years, adjust):
+        """
+        Apply to variables the grow factors for each of the specified
+        calendar years in turn and, if adjust is True, also apply the
+        adjustment ratios for each year, which match the value of income
+        variables to SOI distributions.
+        Note: growing must leave variables as numpy.ndarray type
+        Unread input variables, which are all zeros, are not changed.
+        """
+        years = list(years)
+        read_vars = set(self.__dict__)
+        adjusting = (adjust and 'e00300' in read_vars and len(self.ADJ) != 0)
+        if self.gfactors is not None:
+            factors = np.array([self.gfactors.factor_array(year)
+                                for year in years])
+            varnames = read_vars.intersection(Records.GROWFACTOR_VARS)
+            signed_varnames = read_vars.intersection(
+                Records.SIGNED_GROWFACTOR_VARS)
+        elif adjusting:
+            factors = np.ones((len(years), len(Growfactors.NAMES)))
+            varnames = ['e00300']
+            signed_varnames = list()
+        else:
+            return
+        if adjusting:
             # Interest income
-            adj_array = self.ADJ['INT{}'.format(year)][self.agi_bin].values
-            self.e00300 *= adj_array
+            colnames = ['INT{}'.format(year) for year in years]
+            ratios = np.asarray(self.ADJ[colnames].values,
+                                dtype=np.float64).T
+        if (self.gfactors is not None and
+                self.__dict__.get('_blocks') is not None and
+                'float64' in self._blocks):
+            # grow the variables in the first rows of the float64 block
+            # using one broadcast multiplication for each year
+            self._sync_blocks()
+            block_names = self._block_names['float64']
+            grown_names = [varname for varname in block_names
+                           if varname in Records.GROWFACTOR_VARS]
+            index = [Growfactors.NAME_INDEX[Records.GROWFACTOR_VARS[varname]]
+                     for varname in grown_names]
+            grown = self._blocks['float64'][:len(grown_names)]
+            for yidx in range(len(years)):
+                grown *= factors[yidx, index][:, np.newaxis]
+                if adjusting and 'e00300' in grown_names:
+                    grown[grown_names.index('e00300')] *= (
+                        ratios[yidx][self.agi_bin])
+            varnames = varnames - set(grown_names)
+        for varname in sorted(varnames):
+            column = factors[:, Growfactors.NAME_INDEX[
+                Records.GROWFACTOR_VARS[varname]]]
+            values = getattr(self, varname)
+            grown = values.astype(np.float64, copy=False)
+            for yidx, factor in enumerate(column):
+                grown *= factor
+                if adjusting and varname == 'e00300':
+                    grown *= ratios[yidx][self.agi_bin]
+            if grown is not values:
+                values[:] = grown
+        for varname in sorted(signed_varnames):
+            pos_name, neg_name = Records.SIGNED_GROWFACTOR_VARS[varname]
+            pos_column = factors[:, Growfactors.NAME_INDEX[pos_name]]
+            neg_column = factors[:, Growfactors.NAME_INDEX[neg_name]]
+            values = getattr(self, varname)
+            grown = values.astype(np.float64, copy=False)
+            if np.all(pos_column > 0.) and np.all(neg_column > 0.):
+                # growing never changes the sign of a value, so grow all
+                # values using the factors for non-negative values and
+                # then regrow the (relatively few) negative values
+                negative = np.flatnonzero(grown < 0.)
+                negatives = grown[negative]
+                for pos_factor, neg_factor in zip(pos_column, neg_column):
+                    grown *= pos_factor
+                    negatives *= neg_factor
+                grown[negative] = negatives
+            else:
+                for pos_factor, neg_factor in zip(pos_column, neg_column):
+                    grown *= np.where(grown >= 0., pos_factor, neg_factor)
+            if grown is not values:
+                values[:] = grown
+
+    @staticmethod
+    def _input_arrays(data):
+        """
+        Return dictionary containing the array of each USABLE_READ_VARS
+        variable in specified data, which is the name of a CSV file or a
+        Pandas DataFrame, converted to the type specified in the
+        records_variables.json file.
+        """
+        if Records.INTEGER_VARS is None:
+            Records.read_var_info()
+        if isinstance(data, six.string_types):
+            data = pd.read_csv(data)
+        if not isinstance(data, pd.DataFrame):
+            msg = 'data is neither a string nor a Pandas DataFrame'
+            raise ValueError(msg)
+        arrays = dict()
+        for varname in data.columns:
+            if varname in Records.INTEGER_READ_VARS:
+                arrays[varname] = data[varname].values.astype(np.int64)
+            elif varname in Records.USABLE_READ_VARS:
+                arrays[varname] = data[varname].values.astype(np.float64)
+        return arrays
 
-    def _read_data(self, data, exact_calcs):
+    def _read_data(self, data, exact_calcs, compact_dtypes, block_storage):
         """
         Read Records data from file or use specified DataFrame as data.
         Specifies exact array depending on boolean value of exact_calcs.
+        Stores variables using their compact types if compact_dtypes is True.
+        Stores variables in two-dimensional blocks if block_storage is True.
         """
         # pylint: disable=too-many-branches
         if Records.INTEGER_VARS is None:
             Records.read_var_info()
+        self._compact_dtypes = compact_dtypes
+        self._blocks = None
         # read specified data
-        if isinstance(data, pd.DataFrame):
-            taxdf = data
-        elif isinstance(data, six.string_types):
-            if os.path.isfile(data):
-                taxdf = pd.read_csv(data)
-            else:
-                # cannot call read_egg_ function in unit tests
-                taxdf = read_egg_csv(data)  # pragma: no cover
+        if (isinstance(data, six.string_types) and
+                data.endswith(Records.NPZ_SUFFIX)):
+            READ_VARS = self._read_npz_data(data)
+        elif isinstance(data, six.string_types) and os.path.isdir(data):
+            READ_VARS = self._read_columns_data(data)
         else:
-            msg = 'data is neither a string nor a Pandas DataFrame'
-            raise ValueError(msg)
-        self.dim = len(taxdf)
-        self.index = taxdf.index
-        # create class variables using taxdf column names
-        READ_VARS = set()
-        self.IGNORED_VARS = set()
-        for varname in list(taxdf.columns.values):
-            if varname in Records.USABLE_READ_VARS:
-                READ_VARS.add(varname)
-                if varname in Records.INTEGER_READ_VARS:
-                    setattr(self, varname,
-                            taxdf[varname].astype(np.int64).values)
+            if isinstance(data, pd.DataFrame):
+                taxdf = data
+            elif isinstance(data, six.string_types):
+                if os.path.isfile(data):
+                    taxdf = pd.read_csv(data)
                 else:
-                    setattr(self, varname,
-                            taxdf[varname].astype(np.float64).values)
+                    # cannot call read_egg_ function in unit tests
+                    taxdf = read_egg_csv(data)  # pragma: no cover
             else:
-                self.IGNORED_VARS.add(varname)
+                msg = 'data is neither a string nor a Pandas DataFrame'
+                raise ValueError(msg)
+            self.dim = len(taxdf)
+            self.index = taxdf.index
+            # create class variables using taxdf column names
+            READ_VARS = set()
+            self.IGNORED_VARS = set()
+            for varname in list(taxdf.columns.values):
+                if varname in Records.USABLE_READ_VARS:
+                    READ_VARS.add(varname)
+                    if varname in Records.INTEGER_READ_VARS:
+                        setattr(self, varname,
+                                taxdf[varname].astype(np.int64).values)
+                    else:
+                        setattr(self, varname,
+                                taxdf[varname].astype(np.float64).values)
+                else:
+                    self.IGNORED_VARS.add(varname)
         # check that MUST_READ_VARS are all present in taxdf
         if not Records.MUST_READ_VARS.issubset(READ_VARS):
             msg = 'Records data missing one or more MUST_READ_VARS'
             raise ValueError(msg)
-        # create other class variables that are set to all zeros
-        UNREAD_VARS = Records.USABLE_READ_VARS - READ_VARS
-        ZEROED_VARS = Records.CALCULATED_VARS | UNREAD_VARS
-        for varname in ZEROED_VARS:
-            if varname in Records.INTEGER_VARS:
-                setattr(self, varname,
-                        np.zeros(self.dim, dtype=np.int64))
-            else:
-                setattr(self, varname,
-                        np.zeros(self.dim, dtype=np.float64))
+        # other variables are all zeros and are not created here: each
+        # unread input variable is represented by a shared read-only array
+        # of zeros and each calculated variable is allocated when first
+        # used (see the __getattr__ method)
+        # convert variables that were read to their compact types
+        if compact_dtypes:
+            for varname in READ_VARS & set(Records.COMPACT_TYPES):
+                values = getattr(self, varname)
+                compact_values = values.astype(Records.COMPACT_TYPES[varname])
+                if (varname in Records.INTEGER_VARS and
+                        not np.array_equal(compact_values, values)):
+                    msg = 'not all {} values fit in the {} compact type'
+                    raise ValueError(msg.format(
+                        varname, Records.COMPACT_TYPES[varname]))
+                setattr(self, varname, compact_values)
+        # store variables that were read and calculated variables in blocks
+        if block_storage:
+            self._store_in_blocks(READ_VARS)
         # check for valid MARS values
         if not np.all(np.logical_and(np.greater_equal(self.MARS, 1),
                                      np.less_equal(self.MARS, 5))):
@@ -447,13 +942,143 @@ class Records(object):
         # specify value of exact array
         self.exact[:] = np.where(exact_calcs is True, 1, 0)
 
+    def _read_npz_data(self, npz_filename):
+        """
+        Read Records data from NPZ file written by the write_npz method,
+        loading only the arrays of the Records.USABLE_READ_VARS, and
+        return the set of names of the variables read.
+        """
+        read_vars = set()
+        self.IGNORED_VARS = set()
+        self.dim = None
+        with np.load(npz_filename) as npz:
+            for varname in npz.files:
+                if varname not in Records.USABLE_READ_VARS:
+                    self.IGNORED_VARS.add(varname)
+                    continue
+                if varname in Records.INTEGER_READ_VARS:
+                    dtype = np.int64
+                else:
+                    dtype = np.float64
+                values = np.asarray(npz[varname], dtype=dtype)
+                if self.dim is None:
+                    self.dim = len(values)
+                elif len(values) != self.dim:
+                    msg = 'NPZ data array {} has {} rather than {} elements'
+                    raise ValueError(msg.format(varname, len(values),
+                                                self.dim))
+                setattr(self, varname, values)
+                read_vars.add(varname)
+        if self.dim is None:
+            self.dim = 0
+        self.index = pd.RangeIndex(self.dim)
+        return read_vars
+
+    def _read_columns_data(self, dirname):
+        """
+        Read Records data from directory written by the write_columns
+        method, memory-mapping the NPY file of each variable in copy-on-write
+        mode, and return the set of names of the variables read.
+        """
+        columns_path = os.path.join(dirname, Records.COLUMNS_FILENAME)
+        if not os.path.isfile(columns_path):
+            msg = 'dirname={} does not contain Records columns data'
+            raise ValueError(msg.format(dirname))
+        with open(columns_path) as cfile:
+            varnames = json.load(cfile)
+        read_vars = set()
+        self.IGNORED_VARS = set()
+        self.dim = 0
+        for varname in varnames:
+            if varname not in Records.USABLE_READ_VARS:
+                self.IGNORED_VARS.add(varname)
+                continue
+            values = np.load(os.path.join(dirname, varname + '.npy'),
+                             mmap_mode='c')
+            if read_vars and len(values) != self.dim:
+                msg = 'column {} has {} rather than {} elements'
+                raise ValueError(msg.format(varname, len(values), self.dim))
+            self.dim = len(values)
+            setattr(self, varname, values)
+            read_vars.add(varname)
+        self.index = pd.RangeIndex(self.dim)
+        return read_vars
+
+    def _store_in_blocks(self, read_vars):
+        """
+        Store the arrays of the specified variables that were read and of
+        all the calculated variables as the rows of one two-dimensional
+        block for each array type, and make the array of each variable the
+        view of its block row.  The rows of the variables extrapolated
+        using a single grow factor are first in each block, and the rows
+        of the Records.CHANGING_CALCULATED_VARS are last.
+        """
+        def row_order(varname):
+            """
+            Return key used to sort the names of the variables in a block.
+            """
+            return (varname not in Records.GROWFACTOR_VARS,
+                    varname in Records.CHANGING_CALCULATED_VARS,
+                    varname)
+        self._block_names = dict()
+        for varname in sorted(set(read_vars) | Records.CALCULATED_VARS,
+                              key=row_order):
+            dtype_name = self._var_dtype(varname).name
+            self._block_names.setdefault(dtype_name, list()).append(varname)
+        self._blocks = dict()
+        self._block_rows = dict()
+        for dtype_name, block_names in self._block_names.items():
+            block = np.zeros((len(block_names), self.dim), dtype=dtype_name)
+            for row, varname in enumerate(block_names):
+                if varname in read_vars:
+                    block[row] = self.__dict__[varname]
+                self._block_rows[varname] = (dtype_name, row)
+            self._blocks[dtype_name] = block
+        self._bind_block_views()
+
+    def _bind_block_views(self):
+        """
+        Make the array of each variable stored in a block the view of its
+        block row.
+        """
+        self._block_views = dict()
+        for dtype_name, block_names in self._block_names.items():
+            block = self._blocks[dtype_name]
+            for row, varname in enumerate(block_names):
+                view = block[row]
+                self.__dict__[varname] = view
+                self._block_views[varname] = view
+
+    def _sync_blocks(self):
+        """
+        Copy into its block row the values of each variable stored in a
+        block whose array has been replaced by another array, and make the
+        variable's array the view of its block row again.
+        """
+        for varname, view in self._block_views.items():
+            values = self.__dict__[varname]
+            if values is not view:
+                view[...] = values
+                self.__dict__[varname] = view
+
     def zero_out_changing_calculated_vars(self):
         """
         Set to zero all variables in the Records.CHANGING_CALCULATED_VARS set.
         """
+        if self.__dict__.get('_blocks') is not None:
+            # these variables are in the last rows of their blocks
+            self._sync_blocks()
+            for dtype_name, block_names in self._block_names.items():
+                changing = [varname in Records.CHANGING_CALCULATED_VARS
+                            for varname in block_names]
+                if any(changing):
+                    self._blocks[dtype_name][changing.index(True):].fill(0)
+            return
         for varname in Records.CHANGING_CALCULATED_VARS:
-            var = getattr(self, varname)
-            var.fill(0.)
+            # variables not yet allocated are already zero
+            var = self.__dict__.get(varname)
+            if var is not None:
+                var.fill(0.)
 
     def _read_weights(self, weights):
         """
@@ -590,14 +590,10 @@ class TaxCalcIO(object):
         self.calc.records.mtr_inctax[:] = mtr_inctax * 100.
         self.calc.records.mtr_paytax[:] = mtr_paytax * 100.
         # create and return dump output DataFrame
-        odf = pd.DataFrame()
-        varset = Records.USABLE_READ_VARS | Records.CALCULATED_VARS
-        for varname in varset:
-            vardata = getattr(self.calc.records, varname)
-            if varname in Records.INTEGER_VARS:
-                odf[varname] = vardata
-            else:
-                odf[varname] = vardata.round(2)  # rounded to nearest cent
+        odf = self.calc.records.to_dataframe()
+        float_vars = [varname for varname in odf.columns
+                      if varname not in Records.INTEGER_VARS]
+        odf[float_vars] = odf[float_vars].round(2)  # rounded to nearest cent
         odf['FLPDYR'] = self.tax_year()  # tax calculation year
         return odf
 
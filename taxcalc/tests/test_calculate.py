@@ -10,6 +10,8 @@ from taxcalc import Policy, Records, Calculator, Behavior, Consumption
 from taxcalc import create_distribution_table
 from taxcalc import create_difference_table
 from taxcalc import create_diagnostic_table
+from taxcalc import create_chunked_diagnostic_table
+from taxcalc.calculate import SINGLE_PASS_MTR_KERNELS
 
 
 RAWINPUTFILE_FUNITS = 4
@@ -221,6 +223,116 @@ def test_Calculator_mtr(cps_subsample):
     assert type(mtr_combined) == np.ndarray
 
 
+def test_Calculator_mtr_many(cps_subsample):
+    recs = Records.cps_constructor(data=cps_subsample)
+    calc = Calculator(policy=Policy(), records=recs)
+    variables = ['e00200p', 'e00200s', 'p23250', 'e00900p', 'e19800']
+    with pytest.raises(ValueError):
+        calc.mtr_many(variables + ['bad_income_type'])
+    mtrs = calc.mtr_many(variables, negative_finite_diff=True)
+    assert sorted(mtrs.keys()) == sorted(variables)
+    iitax = calc.records.iitax.copy()
+    for variable_str in variables:
+        exp = calc.mtr(variable_str=variable_str, negative_finite_diff=True)
+        for res, exp_res in zip(mtrs[variable_str], exp):
+            assert np.array_equal(np.isnan(res), np.isnan(exp_res))
+            assert np.array_equal(np.nan_to_num(res), np.nan_to_num(exp_res))
+    assert np.array_equal(calc.records.iitax, iitax)
+
+
+def test_Calculator_mtr_single_pass_one_variable(cps_subsample):
+    # single-pass mode is not used for only one distinct variable
+    recs = Records.cps_constructor(data=cps_subsample)
+    calc = Calculator(policy=Policy(), records=recs)
+    num_kernels = len(SINGLE_PASS_MTR_KERNELS)
+    exp = calc.mtr(variable_str='e00200s')
+    res = calc.mtr(variable_str='e00200s', single_pass=True)
+    mtrs = calc.mtr_many(['e00200s', 'e00200s'], single_pass=True)
+    assert len(SINGLE_PASS_MTR_KERNELS) == num_kernels
+    for res_array, exp_array in zip(res, exp):
+        assert np.allclose(res_array, exp_array, equal_nan=True)
+    for res_array, exp_array in zip(mtrs['e00200s'], exp):
+        assert np.allclose(res_array, exp_array, equal_nan=True)
+
+
+@pytest.mark.pre_release
+def test_Calculator_mtr_single_pass(cps_subsample):
+    # compiling the single-pass kernel takes 30 to 50 seconds
+    recs = Records.cps_constructor(data=cps_subsample)
+    calc = Calculator(policy=Policy(), records=recs)
+    variables = ['e00200s', 'e00300']
+    exp = calc.mtr_many(variables, negative_finite_diff=True)
+    iitax = calc.records.iitax.copy()
+    aftertax = calc.records.aftertax_income.copy()
+    num_kernels = len(SINGLE_PASS_MTR_KERNELS)
+    mtrs = calc.mtr_many(variables + ['e00200s'], single_pass=True,
+                         negative_finite_diff=True)
+    assert len(SINGLE_PASS_MTR_KERNELS) == num_kernels + 1
+    assert np.allclose(calc.records.iitax, iitax)
+    assert np.allclose(calc.records.aftertax_income, aftertax)
+    for variable_str in variables:
+        for res, exp_res in zip(mtrs[variable_str], exp[variable_str]):
+            assert np.allclose(res, exp_res, equal_nan=True)
+    # kernel compiled for the same set of variables is used again
+    res = calc.mtr_many(list(reversed(variables)), single_pass=True)
+    assert len(SINGLE_PASS_MTR_KERNELS) == num_kernels + 1
+    exp = calc.mtr_many(variables)
+    for variable_str in variables:
+        for res_array, exp_array in zip(res[variable_str],
+                                        exp[variable_str]):
+            assert np.allclose(res_array, exp_array, equal_nan=True)
+    # reform that the single-pass kernel cannot calculate
+    calc.policy.implement_reform({2014: {'_ID_BenefitSurtax_crt': [0.02]}})
+    exp = calc.mtr_many(variables)
+    res = calc.mtr_many(variables, single_pass=True)
+    for variable_str in variables:
+        for res_array, exp_array in zip(res[variable_str],
+                                        exp[variable_str]):
+            assert np.allclose(res_array, exp_array, equal_nan=True)
+
+
+def test_Calculator_mtr_restores_records(cps_subsample):
+    consump = Consumption()
+    consump.update_consumption({2013: {'_MPC_e20400': [0.05]}})
+    recs = Records.cps_constructor(data=cps_subsample)
+    calc = Calculator(policy=Policy(), records=recs, consumption=consump)
+    calc.calc_all()
+    varnames = Records.USABLE_READ_VARS | Records.CALCULATED_VARS
+    pre = recs.snapshot(varnames)
+    for variable_str in ['e00200p', 'e00650', 'e26270']:
+        calc.mtr(variable_str=variable_str)
+        assert calc.records is recs
+        for varname in varnames:
+            assert np.array_equal(getattr(recs, varname), pre[varname])
+
+
+def test_Calculator_AGI_surtax_does_not_carry_over():
+    # AGIsurtax starts the surtax subtotal in each calc_all call, so the
+    # subtotal does not include the surtax calculated in a previous call
+    funit = (
+        u'RECID,MARS,FLPDYR,e00200,e00200p\n'
+        u'1,    1,   2013,  500000,500000\n'
+        u'2,    1,   2013,  100000,100000\n'
+    )
+    pol = Policy()
+    pol.implement_reform({2013: {'_AGI_surtax_trt': [0.05],
+                                 '_AGI_surtax_thd': [[200000] * 5]}})
+    recs = Records(data=pd.read_csv(StringIO(funit)), gfactors=None,
+                   weights=None, start_year=2013)
+    calc = Calculator(policy=pol, records=recs)
+    calc.calc_all()
+    surtax = calc.records.surtax.copy()
+    exp_surtax = 0.05 * np.maximum(calc.records.c00100 - 200000., 0.)
+    assert np.allclose(surtax, exp_surtax)
+    assert surtax[0] > 0. and surtax[1] == 0.
+    calc.calc_all()
+    assert np.allclose(calc.records.surtax, surtax)
+    # no surtax left over after the AGI surtax is repealed
+    calc.policy.AGI_surtax_trt = 0.
+    calc.calc_all()
+    assert np.all(calc.records.surtax == 0.)
+
+
 def test_Calculator_mtr_when_PT_rates_differ():
     reform = {2013: {'_II_rt1': [0.40],
                      '_II_rt2': [0.40],
@@ -252,6 +364,186 @@ def test_Calculator_mtr_when_PT_rates_differ():
     assert np.allclose(mtr1, mtr2, rtol=0.0, atol=1e-06)
 
 
+def test_Calculator_num_threads(cps_subsample):
+    recs = Records.cps_constructor(data=cps_subsample)
+    calc = Calculator(policy=Policy(), records=recs, num_threads=2)
+    assert calc.num_threads == 2
+    assert calc.current_law_version().num_threads == 2
+    with pytest.raises(ValueError):
+        Calculator(policy=Policy(), records=recs, num_threads=0)
+
+
+def test_Calculator_incremental(cps_subsample):
+    calc = Calculator(policy=Policy(),
+                      records=Records.cps_constructor(data=cps_subsample),
+                      incremental=True)
+    calc.calc_all()
+    assert 'AGI' in calc.functions_run
+    calc.calc_all()
+    assert calc.functions_run == []
+    # change records input variable
+    calc.records.e00300 = calc.records.e00300 + 100.
+    calc.calc_all(changed_vars=['e00300'])
+    assert 'AGI' in calc.functions_run
+    assert 'EI_PayrollTax' not in calc.functions_run
+    # change policy parameters
+    calc.policy.EITC_c = calc.policy.EITC_c * 1.1
+    calc.calc_all()
+    assert 'EITC' in calc.functions_run
+    assert 'AGI' not in calc.functions_run
+    calc.policy.II_rt7 = calc.policy.II_rt7 + 0.05
+    calc.calc_all()
+    assert 'TAXINC_TO_AMT' in calc.functions_run
+    assert 'ItemDed' not in calc.functions_run
+    # compare with results of full calculation
+    exp_calc = copy.deepcopy(calc)
+    exp_calc.incremental = False
+    exp_calc.calc_all(zero_out_calc_vars=True)
+    assert len(exp_calc.functions_run) > len(calc.functions_run)
+    for varname in ['iitax', 'payrolltax', 'aftertax_income', 'c59660']:
+        assert np.allclose(getattr(calc.records, varname),
+                           getattr(exp_calc.records, varname))
+    # mtr computations in incremental mode
+    calc.calc_all(zero_out_calc_vars=True)
+    assert set(calc.functions_run) == (set(exp_calc.functions_run) -
+                                       set(['BenefitSurtax',
+                                            'BenefitLimitation']))
+    mtrs = calc.mtr(variable_str='e00300')
+    exp_mtrs = exp_calc.mtr(variable_str='e00300')
+    for res, exp_res in zip(mtrs, exp_mtrs):
+        assert np.allclose(res, exp_res)
+    calc.calc_all()
+    assert 'AGI' in calc.functions_run
+    assert np.allclose(calc.records.iitax, exp_calc.records.iitax)
+
+
+def test_Calculator_incremental_unnamed_change(cps_subsample):
+    calc = Calculator(policy=Policy(),
+                      records=Records.cps_constructor(data=cps_subsample),
+                      incremental=True)
+    calc.calc_all()
+    num_functions = len(calc.functions_run)
+    # change records input variable in place without naming it
+    calc.records.e00200 *= 1.1
+    calc.calc_all()
+    assert len(calc.functions_run) == num_functions
+    exp_calc = copy.deepcopy(calc)
+    exp_calc.incremental = False
+    exp_calc.calc_all(zero_out_calc_vars=True)
+    assert np.allclose(calc.records.iitax, exp_calc.records.iitax)
+    assert np.allclose(calc.records.payrolltax, exp_calc.records.payrolltax)
+    calc.calc_all()
+    assert calc.functions_run == []
+
+
+def test_Calculator_reform_sweep(cps_subsample):
+    calc = Calculator(policy=Policy(),
+                      records=Records.cps_constructor(data=cps_subsample))
+    calc.calc_all()
+    iitax = calc.records.iitax.copy()
+    reforms = [{2014: {'_II_em': [xval]}} for xval in [3000., 4000., 5000.]]
+    totals = calc.reform_sweep(reforms)
+    assert list(totals.columns) == Calculator.SWEEP_TAX_VARIABLES
+    assert len(totals.index) == len(reforms)
+    assert totals['iitax'].is_monotonic_decreasing
+    assert np.array_equal(calc.records.iitax, iitax)
+    # compare with results of a Calculator object for the second reform
+    pol = Policy()
+    pol.implement_reform(reforms[1])
+    exp_calc = Calculator(policy=pol,
+                          records=Records.cps_constructor(data=cps_subsample))
+    exp_calc.calc_all()
+    exp_iitax = (exp_calc.records.s006 * exp_calc.records.iitax).sum()
+    assert np.allclose(totals['iitax'][1], exp_iitax * 1e-9)
+    # evaluate reforms in parallel using shared copy of records
+    assert totals.equals(calc.reform_sweep(reforms, num_workers=2))
+    assert not isinstance(calc.records.e00200, np.memmap)
+    with pytest.raises(ValueError):
+        calc.reform_sweep(reforms, num_workers=0)
+
+
+def test_Calculator_revenue_neutral_value(cps_subsample):
+    calc = Calculator(policy=Policy(),
+                      records=Records.cps_constructor(data=cps_subsample))
+
+    def exemption_reform(xval):
+        return {2014: {'_II_em': [xval]}}
+
+    xval = calc.revenue_neutral_value(exemption_reform, 3000., 5000.)
+    assert abs(xval - calc.policy.II_em) < 0.01
+    with pytest.raises(ValueError):
+        calc.revenue_neutral_value(exemption_reform, 4000., 5000.)
+    with pytest.raises(ValueError):
+        calc.revenue_neutral_value(exemption_reform, 3000., 5000.,
+                                   tax='bad_tax')
+    with pytest.raises(ValueError):
+        calc.revenue_neutral_value(exemption_reform, 5000., 3000.)
+
+
+def test_Calculator_calc_all_chunked(cps_subsample):
+    reform = {2017: {'_II_em': [5000]}}
+    pol = Policy()
+    pol.implement_reform(reform)
+    calc = Calculator(policy=pol,
+                      records=Records.cps_constructor(data=cps_subsample))
+    calc.advance_to_year(2017)
+    chunks = Records.read_chunks(data=cps_subsample, chunk_size=50,
+                                 weights=Records.CPS_WEIGHTS_FILENAME,
+                                 adjust_ratios=None, start_year=2014)
+    calcs = list(calc.calc_all_chunked(chunks))
+    assert calc.records.iitax.sum() == 0.
+    calc.calc_all()
+    assert len(calcs) == (calc.records.dim + 49) // 50
+    for chunk_calc in calcs:
+        assert chunk_calc.current_year == 2017
+        assert chunk_calc.policy.II_em == 5000
+    for varname in Records.CALCULATED_VARS:
+        chunked = np.concatenate([getattr(chunk_calc.records, varname)
+                                  for chunk_calc in calcs])
+        assert np.allclose(chunked, getattr(calc.records, varname),
+                           rtol=0.0, atol=1e-9)
+    dtable = create_diagnostic_table(calc)
+    chunked_dtable = create_chunked_diagnostic_table(iter(calcs))
+    assert np.allclose(chunked_dtable.values, dtable.values)
+    assert list(chunked_dtable.index) == list(dtable.index)
+    assert list(chunked_dtable.columns) == [2017]
+    with pytest.raises(ValueError):
+        create_chunked_diagnostic_table(list())
+    with pytest.raises(ValueError):
+        calcs[1].increment_year()
+        create_chunked_diagnostic_table(calcs)
+    chunks = Records.read_chunks(data=cps_subsample, chunk_size=50,
+                                 start_year=2018)
+    with pytest.raises(ValueError):
+        next(calc.calc_all_chunked(chunks))
+
+
+def test_Calculator_std_or_item_choice():
+    reform = {2013: {'_AGI_surtax_trt': [0.05],
+                     '_AGI_surtax_thd': [[100000, 100000, 100000,
+                                          100000, 100000]]}}
+    funit = (
+        u'RECID,MARS,e00200,e00200p,e18400,e19200\n'
+        u'1,    2,   400000,400000, 40000, 30000\n'
+        u'2,    1,   150000,150000, 0,     0\n'
+    )
+    pol = Policy()
+    pol.implement_reform(reform)
+    rec = Records(pd.read_csv(StringIO(funit)), gfactors=None,
+                  weights=None, start_year=2013)
+    calc = Calculator(policy=pol, records=rec)
+    calc.calc_all(zero_out_calc_vars=True)
+    # first unit itemizes and second unit takes the standard deduction
+    assert calc.records.standard[0] == 0.
+    assert calc.records.c04470[0] > 0.
+    assert calc.records.standard[1] > 0.
+    assert calc.records.c04470[1] == 0.
+    assert calc.records.c21060[1] == 0.
+    # AGI surtax is included once in the surtax subtotal
+    exp_surtax = 0.05 * (calc.records.c00100 - 100000.)
+    assert np.allclose(calc.records.surtax, exp_surtax)
+
+
 def test_Calculator_create_difference_table(cps_subsample):
     # create current-law Policy object and use to create Calculator calc1
     cps1 = Records.cps_constructor(data=cps_subsample)
@@ -344,6 +636,28 @@ def test_ID_HC_vs_BS(cps_subsample):
                        bs_calc.records.iitax)
 
 
+def test_Calculator_counterfactual(cps_subsample):
+    recs = Records.cps_constructor(data=cps_subsample)
+    calc = Calculator(policy=Policy(), records=recs)
+    calc.calc_all()
+    iitax = calc.records.iitax.copy()
+    param_values = {'ID_Charity_hc': 1., 'ID_InterestPaid_hc': 1.}
+    varnames = ['iitax', 'c04470', 'c00100']
+    res = calc.counterfactual(param_values, varnames)
+    assert sorted(res.keys()) == sorted(varnames)
+    assert np.array_equal(calc.records.iitax, iitax)
+    assert calc.policy.ID_Charity_hc == 0.
+    # compare with results of a Calculator copy that uses the parameters
+    exp_calc = copy.deepcopy(calc)
+    exp_calc.policy.ID_Charity_hc = 1.
+    exp_calc.policy.ID_InterestPaid_hc = 1.
+    exp_calc.calc_all()
+    for varname in varnames:
+        assert np.allclose(res[varname],
+                           getattr(exp_calc.records, varname))
+    assert not np.allclose(res['iitax'], iitax)
+
+
 def test_Calculator_using_nonstd_input(rawinputfile):
     # check Calculator handling of raw, non-standard input data with no aging
     policy = Policy()
@@ -1,9 +1,13 @@
+import os
 import sys
+import copy
+import subprocess
 import pytest
 from six.moves import reload_module
 import numpy as np
 from pandas import DataFrame
 from taxcalc.decorators import *
+from taxcalc import Policy, Records, functions
 from pandas.util.testing import assert_frame_equal
 
 
@@ -333,6 +337,178 @@ def test_force_no_numba():
     exp = DataFrame(data=[[2.0, 4.0]] * 5,
                     columns=["a", "b"])
     assert_frame_equal(ans, exp)
-    # Restore numba module
+    # Restore numba module and the decorators that use it
     if nmba:
         sys.modules['numba'] = nmba
+        reload_module(taxcalc.decorators)
+
+
+def test_iterate_jit_caches_hl_func():
+    pm = Foo()
+    pf = Foo()
+    pm.a = np.ones((5,))
+    pm.b = np.ones((5,))
+    pf.x = np.ones((5,))
+    pf.y = np.ones((5,))
+    pf.z = np.ones((5,))
+    Magic_calc2.hl_func_cache.clear()
+    ans1 = Magic_calc2(pm, pf)
+    assert len(Magic_calc2.hl_func_cache) == 1
+    ans2 = Magic_calc2(pm, pf)
+    assert len(Magic_calc2.hl_func_cache) == 1
+    assert_frame_equal(ans1, ans2)
+    # swapping the argument objects produces a different attribute layout
+    ans3 = Magic_calc2(pf, pm)
+    assert len(Magic_calc2.hl_func_cache) == 2
+    assert_frame_equal(ans1, ans3)
+
+
+def test_create_toplevel_function_string_no_dataframe():
+    ans = create_toplevel_function_string(['a', 'b'], ['d', 'e'],
+                                          ['pm', 'pm', 'pf', 'pm'],
+                                          dataframe=False)
+    exp = ("def hl_func(pm, pf):\n"
+           "        (pm.a, pm.b) = \\\n"
+           "        applied_f(get_values(pm.a), get_values(pm.b), "
+           "get_values(pf.d), get_values(pm.e), )\n")
+    assert ans == exp
+
+
+def test_iterate_jit_without_dataframe():
+    pm = Foo()
+    pf = Foo()
+    pm.a = np.ones((5,))
+    pm.b = np.ones((5,))
+    pf.x = np.ones((5,))
+    pf.y = np.ones((5,))
+    pf.z = np.ones((5,))
+    a_array = pm.a
+    ans = Magic_calc3(pm, pf, dataframe=False)
+    assert ans is None
+    # results are written in place into the original output arrays
+    assert pm.a is a_array
+    assert np.allclose(pm.a, [2.0] * 5)
+    assert np.allclose(pm.b, [3.0] * 5)
+
+
+def test_iterate_jit_parallel():
+    pm = Foo()
+    pf = Foo()
+    pm.a = np.zeros((1000,))
+    pm.b = np.zeros((1000,))
+    pf.x = np.arange(1000.)
+    pf.y = np.ones((1000,))
+    pf.z = np.arange(1000.) * 2.
+    ans = Magic_calc3(pm, pf, num_threads=2)
+    exp = Magic_calc3(pm, pf)
+    assert_frame_equal(ans, exp)
+    assert np.allclose(pm.a, pf.x + pf.y)
+    assert np.allclose(pm.b, pf.x + pf.y + pf.z)
+
+
+@pytest.mark.parametrize('func_name', ['EI_PayrollTax', 'AGI'])
+def test_iterate_jit_parallel_tax_function(func_name, cps_subsample):
+    func = getattr(functions, func_name)
+    policy = Policy()
+    recs = Records.cps_constructor(data=cps_subsample)
+    serial = copy.deepcopy(recs)
+    func(policy, serial)
+    parallel = copy.deepcopy(recs)
+    func(policy, parallel, num_threads=2)
+    for varname in Records.CALCULATED_VARS:
+        assert np.array_equal(getattr(serial, varname),
+                              getattr(parallel, varname))
+
+
+FORK_AFTER_THREADS_SCRIPT = """
+import multiprocessing
+import numpy as np
+import numba
+from taxcalc.decorators import iterate_jit
+
+
+@iterate_jit(nopython=True)
+def Magic(x, y, a):
+    a = x + y
+    return a
+
+
+class Foo(object):
+    pass
+
+
+pm = Foo()
+pf = Foo()
+pf.x = np.arange(1000.)
+pf.y = np.ones((1000,))
+pf.a = np.zeros((1000,))
+Magic(pm, pf, dataframe=False, num_threads=2)
+pool = multiprocessing.Pool(2)
+assert pool.map(abs, [-1, -2]) == [1, 2]
+pool.close()
+pool.join()
+print(numba.threading_layer())
+"""
+
+
+def test_iterate_jit_parallel_then_fork_exits(tmpdir):
+    script = tmpdir.join('fork_after_threads.py')
+    script.write(FORK_AFTER_THREADS_SCRIPT)
+    pkg_dir = os.path.dirname(os.path.abspath(functions.__file__))
+    path = [os.path.dirname(pkg_dir), os.environ.get('PYTHONPATH', '')]
+    env = dict(os.environ, NUMBA_NUM_THREADS='2',
+               PYTHONPATH=os.pathsep.join(path))
+    env.pop('NUMBA_THREADING_LAYER', None)
+    out = subprocess.check_output([sys.executable, str(script)],
+                                  env=env, timeout=300)
+    assert out.decode('ascii').strip() == 'workqueue'
+
+
+def test_create_apply_function_string_parallel():
+    ans = create_apply_function_string(['a', 'b'], ['x', 'y'], [],
+                                       parallel=True)
+    exp = ("def ap_func(x_0,x_1,x_2,x_3):\n"
+           "  for i in prange(len(x_0)):\n"
+           "    x_0[i],x_1[i] = jitted_f(x_2[i],x_3[i])\n"
+           "  return x_0,x_1\n")
+    assert ans == exp
+
+
+def test_create_fused_function_string():
+    ans = create_fused_function_string([('f_0', ['a'], ['x', 'y']),
+                                        'b = a + z\n'],
+                                       ['a', 'x', 'y', 'b', 'z'],
+                                       ['a', 'b'], [])
+    exp = ("def fused_func(arr_a,arr_x,arr_y,arr_b,arr_z):\n"
+           "  for i in range(len(arr_a)):\n"
+           "    a = arr_a[i]\n"
+           "    x = arr_x[i]\n"
+           "    y = arr_y[i]\n"
+           "    b = arr_b[i]\n"
+           "    z = arr_z[i]\n"
+           "    a = f_0(x,y)\n"
+           "    b = a + z\n"
+           "    arr_a[i] = a\n"
+           "    arr_b[i] = b\n")
+    assert ans == exp
+
+
+def test_make_fused_function():
+    pm = Foo()
+    pf = Foo()
+    pm.w = np.ones((5,))
+    pf.a = np.zeros((5,))
+    pf.b = np.zeros((5,))
+    pf.x = np.ones((5,))
+    pf.y = np.ones((5,))
+    pf.z = np.ones((5,))
+    fused = make_fused_function([Magic_calc5,
+                                 'tmp = a * 2.\nb = b + tmp\n'],
+                                nopython=True)
+    ans = fused(pm, pf)
+    assert ans is None
+    assert np.allclose(pf.a, [2.0] * 5)
+    assert np.allclose(pf.b, [4.0 + 4.0] * 5)
+    assert len(fused.fused_cache) == 1
+    fused(pm, pf)
+    assert len(fused.fused_cache) == 1
@@ -1,6 +1,8 @@
 import os
 import tempfile
 import pytest
+import numpy as np
+from numpy.testing import assert_allclose
 from taxcalc import Growfactors
 
 
@@ -57,3 +59,41 @@ def test_correct_Growfactors_usage():
     assert len(wgr) == 9
     val = gf.factor_value('AWAGE', 2013)
     assert val > 1.0
+
+
+def test_factor_arrays():
+    gf = Growfactors()
+    for year in range(gf.first_year, gf.last_year + 1):
+        factors = gf.factor_array(year)
+        for idx, name in enumerate(Growfactors.NAMES):
+            assert factors[idx] == gf.factor_value(name, year)
+            assert gf.gfdf[name][year] == factors[idx]
+    with pytest.raises(ValueError):
+        gf.factor_array(gf.last_year + 1)
+    # cumulative factors are products of the annual factors
+    syr = gf.first_year
+    lyr = gf.last_year
+    assert np.all(gf.cumulative_factor_array(syr + 2, syr + 2) == 1.0)
+    expected = np.ones(len(Growfactors.NAMES))
+    for year in range(syr + 3, lyr + 1):
+        expected *= gf.factor_array(year)
+        cfactors = gf.cumulative_factor_array(syr + 2, year)
+        assert_allclose(cfactors, expected, atol=0.0, rtol=1e-12)
+    val = gf.cumulative_factor_value('AWAGE', syr, syr + 2)
+    assert_allclose(val, (gf.factor_value('AWAGE', syr + 1) *
+                          gf.factor_value('AWAGE', syr + 2)), rtol=1e-12)
+    with pytest.raises(ValueError):
+        gf.cumulative_factor_array(syr + 2, syr + 1)
+    with pytest.raises(ValueError):
+        gf.cumulative_factor_array(syr - 1, syr + 1)
+    with pytest.raises(ValueError):
+        gf.cumulative_factor_value('BADNAME', syr, syr + 1)
+    # update changes matrix of only the updated instance
+    gf1 = Growfactors()
+    gf2 = Growfactors()
+    gf1.update('AWAGE', syr + 1, 0.01)
+    assert gf1.factor_value('AWAGE', syr + 1) == \
+        gf2.factor_value('AWAGE', syr + 1) + 0.01
+    assert_allclose(gf1.cumulative_factor_value('AWAGE', syr, syr + 1),
+                    gf2.cumulative_factor_value('AWAGE', syr, syr + 1) + 0.01,
+                    rtol=1e-12)
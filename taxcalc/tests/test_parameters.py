@@ -308,3 +308,91 @@ def test_expand_2d_partial_expand():
                                     inflate=True, inflation_rates=inf_rates,
                                     num_years=4)
     assert np.allclose(res, exp, atol=0.01, rtol=0.0)
+
+
+def test_expand_rounding_same_as_round_builtin():
+    """
+    Test that the vectorized _expand_?D and _expand_arrays methods round
+    each inflated value exactly as the round builtin function does.
+    """
+    # pylint: disable=protected-access
+    def loop_expand_2d(ary, irates, num_years):
+        ans = np.zeros((max(num_years, len(ary)), ary.shape[1]))
+        ans[:len(ary), :] = ary
+        for i in range(ary.shape[0], num_years):
+            for j in range(ary.shape[1]):
+                cur = ans[i - 1, j] * (1. + irates[i - 1])
+                ans[i, j] = round(cur, 2) if cur < 9e99 else 9e99
+        return ans
+    rng = np.random.RandomState(123456)
+    irates = list(rng.uniform(-0.02, 0.10, 10))
+    arrays = list()
+    for nrows in [1, 2, 3, 10, 11]:
+        ary = np.round(rng.uniform(-1e6, 1e6, size=(nrows, 8)), 3)
+        ary[0, 0] = 9e99
+        ary[0, 1] = 3.5e15
+        ary[0, 2:] = [0.285, 1.005, 2.675, 1.115, 0.125, 1234.565]
+        exp = loop_expand_2d(ary, irates, 10)
+        res = ParametersBase._expand_2D(ary, inflate=True,
+                                        inflation_rates=irates, num_years=10)
+        assert np.array_equal(res, exp)
+        res = ParametersBase._expand_1D(ary[:, 7], inflate=True,
+                                        inflation_rates=irates, num_years=10)
+        assert np.array_equal(res, exp[:, 7])
+        arrays.extend([ary, ary[:, 6]])
+    expanded = ParametersBase._expand_arrays(arrays, inflation_rates=irates,
+                                             num_years=10)
+    for ary, res in zip(arrays, expanded):
+        exp = ParametersBase._expand_array(ary, inflate=True,
+                                           inflation_rates=irates,
+                                           num_years=10)
+        assert np.array_equal(res, exp)
+
+
+def test_cached_default_parameters():
+    """
+    Test that the cached default parameter values are not changed by
+    changes in the parameters of objects constructed using them.
+    """
+    pol1 = Policy()
+    pol1.implement_reform({2016: {'_II_em': [5000.], '_STD_cpi': False}})
+    pol1._II_rt1[0] = 0.5  # pylint: disable=protected-access
+    paramdata = Policy.default_data(metadata=True)
+    paramdata['_II_rt2']['value'][0] = 0.5
+    pol2 = Policy()
+    # pylint: disable=protected-access
+    assert pol2._II_em is not pol1._II_em
+    assert pol2._II_rt1[0] != 0.5
+    assert pol2._II_rt2[0] != 0.5
+    assert pol2._vals['_STD']['cpi_inflated']
+    assert Policy.default_data()['_II_rt2'][0] != 0.5
+    for name in pol2._vals:
+        if name in ['_II_em', '_II_rt1', '_STD']:
+            assert not np.array_equal(getattr(pol1, name),
+                                      getattr(pol2, name))
+        else:
+            assert np.array_equal(getattr(pol1, name), getattr(pol2, name))
+    # expanded values depend on the number of years
+    pol3 = Policy(num_years=5)
+    assert np.array_equal(pol3._II_em, pol2._II_em[:5])
+
+
+def test_lazy_current_year_values():
+    """
+    Test that current_year parameter values are looked up when used and
+    that set_year resets any changed current_year values.
+    """
+    # pylint: disable=protected-access,no-member
+    pol = Policy()
+    assert 'II_em' not in pol.__dict__
+    assert pol.II_em == pol._II_em[0]
+    assert np.array_equal(pol.STD, pol._STD[0])
+    pol.set_year(2019)
+    assert pol.II_em == pol._II_em[2019 - pol.start_year]
+    pol.II_em = 1.0
+    assert pol.II_em == 1.0
+    pol.set_year(2020)
+    assert pol.II_em == pol._II_em[2020 - pol.start_year]
+    assert not hasattr(pol, 'e00200')
+    with pytest.raises(AttributeError):
+        pol.not_a_parameter  # pylint: disable=pointless-statement
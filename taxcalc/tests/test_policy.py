@@ -1,6 +1,7 @@
 import os
 import sys
 import six
+import copy
 import json
 import tempfile
 import numpy as np
@@ -616,6 +617,27 @@ def test_current_law_version():
     assert clp_mte_2016 == clv_mte_2016
 
 
+def test_update_copy():
+    pol = Policy()
+    pol.implement_reform({2016: {'_II_em': [5000], '_STD_cpi': False}})
+    pol.set_year(2017)
+    em_2017 = pol.II_em
+    reform = {2017: {'_II_rt7': [0.45], '_II_em_cpi': False,
+                     '_STD': [[7000, 14000, 7000, 10000, 14000]]}}
+    exp_pol = copy.deepcopy(pol)
+    exp_pol.implement_reform(reform)
+    pcopy = pol._update_copy()
+    pcopy.implement_reform(reform)
+    for name in pol._vals:
+        assert np.array_equal(getattr(pcopy, name), getattr(exp_pol, name))
+    assert pcopy._vals == exp_pol._vals
+    # the original policy is unchanged
+    assert pol.II_rt7 != 0.45
+    assert pol.II_em == em_2017
+    assert pol._vals['_II_em']['cpi_inflated']
+    assert not pol._vals['_STD']['cpi_inflated']
+
+
 def test_clp_section_titles(tests_path):
     """
     Check section titles in current_law_policy.json file.
@@ -852,6 +874,24 @@ def test_validate_param_values_warnings_errors():
     assert len(pol6.reform_errors) > 0
 
 
+def test_validate_param_values_messages():
+    """
+    Check messages about out-of-range values of a policy parameter that
+    varies by filing status and has a current-law minimum value.
+    """
+    clp = Policy()
+    pol = Policy()
+    pol.implement_reform({2024: {'_STD': [[1000, 20000, 500, 9e9, 9e9]]}})
+    assert len(pol.reform_errors) == 0
+    exp = ''
+    for year in range(2024, Policy.LAST_BUDGET_YEAR + 1):
+        for idx in [0, 2]:
+            exp += 'WARNING: {} _STD_{} value {} < min value {}\n'.format(
+                year, idx, pol._STD[year - 2013, idx],
+                clp._STD[year - 2013, idx])
+    assert pol.reform_warnings == exp
+
+
 def test_indexing_rates_for_update():
     """
     Check private _indexing_rates_for_update method.
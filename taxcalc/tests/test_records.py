@@ -1,5 +1,10 @@
 import os
+import copy
 import json
+import pickle
+import shutil
+import tempfile
+import multiprocessing
 import numpy as np
 from numpy.testing import assert_array_equal
 import pandas as pd
@@ -48,6 +53,321 @@ def test_correct_Records_instantiation(cps_subsample):
     assert rec2.current_year == rec2.data_year
 
 
+def test_read_chunks(cps_path, cps_subsample):
+    with pytest.raises(ValueError):
+        list(Records.read_chunks(data=cps_subsample, chunk_size=0))
+    with pytest.raises(ValueError):
+        list(Records.read_chunks(data=list()))
+    # chunks of a sub-sample have the same weights as the whole sub-sample
+    rec = Records.cps_constructor(data=cps_subsample)
+    chunks = list(Records.read_chunks(data=cps_subsample, chunk_size=100,
+                                      weights=Records.CPS_WEIGHTS_FILENAME,
+                                      adjust_ratios=None,
+                                      start_year=CPSCSV_YEAR))
+    assert len(chunks) == (len(cps_subsample) + 99) // 100
+    assert sum([chunk.dim for chunk in chunks]) == rec.dim
+    for varname in ['s006', 'e00200', 'MARS']:
+        chunked = np.concatenate([getattr(chunk, varname)
+                                  for chunk in chunks])
+        assert np.allclose(chunked, getattr(rec, varname))
+    for chunk in chunks:
+        chunk.increment_year()
+    assert np.allclose(np.concatenate([chunk.s006 for chunk in chunks]),
+                       rec.WT.WT2015 * 0.01)
+    # chunks of a CSV file are read one chunk at a time
+    chunks = Records.read_chunks(data=cps_path, chunk_size=5000,
+                                 weights=Records.CPS_WEIGHTS_FILENAME,
+                                 adjust_ratios=None, start_year=CPSCSV_YEAR)
+    chunk = next(chunks)
+    assert chunk.dim == 5000
+    assert np.allclose(chunk.s006, pd.read_csv(os.path.join(
+        Records.CUR_PATH, Records.CPS_WEIGHTS_FILENAME)).WT2014[:5000] * 0.01)
+
+
+def test_snapshot_and_restore(cps_subsample):
+    rec = Records.cps_constructor(data=cps_subsample)
+    e00200 = rec.e00200.copy()
+    snap = rec.snapshot(['e00200', 'e00200p', 'iitax'])
+    assert set(snap.keys()) == set(['e00200', 'e00200p', 'iitax'])
+    for _ in range(2):
+        rec.e00200 += 1.
+        rec.e00200p = rec.e00200p + 1.
+        rec.iitax.fill(1.)
+        rec.restore(snap)
+        assert_array_equal(rec.e00200, e00200)
+        assert_array_equal(rec.e00200p, snap['e00200p'])
+        assert np.all(rec.iitax == 0.)
+
+
+def attached_iitax(dirname):
+    """
+    Return iitax computed in a worker process using shared Records data.
+    """
+    recs = Records.attach_shared(dirname)
+    calc = Calculator(policy=Policy(), records=recs, verbose=False)
+    calc.calc_all()
+    return calc.records.iitax
+
+
+def test_shared_columns(cps_subsample):
+    with pytest.raises(ValueError):
+        Records.attach_shared(os.path.dirname(__file__))
+    rec = Records.cps_constructor(data=cps_subsample)
+    calc = Calculator(policy=Policy(), records=rec, verbose=False)
+    calc.calc_all()
+    dirname = tempfile.mkdtemp()
+    try:
+        with pytest.raises(ValueError):
+            rec.share_columns(os.path.join(dirname, 'nonexistent'))
+        rec.share_columns(dirname)
+        assert isinstance(rec.e00200, np.memmap)
+        assert not isinstance(rec.iitax, np.memmap)
+        rec2 = Records.attach_shared(dirname)
+        assert rec2.current_year == rec.current_year
+        assert rec2.data_year == rec.data_year
+        assert rec2.dim == rec.dim
+        assert np.all(rec2.iitax == 0.)
+        assert_array_equal(rec2.e00200, rec.e00200)
+        assert_array_equal(rec2.num, rec.num)
+        assert_array_equal(rec2.WT.values, rec.WT.values)
+        # changes made in place are not seen by other attached objects
+        rec2.increment_year()
+        assert np.allclose(rec2.s006, rec.WT.WT2015 * 0.01)
+        assert_array_equal(Records.attach_shared(dirname).e00200, rec.e00200)
+        assert not np.allclose(rec2.e00200, rec.e00200)
+        # worker process attaches to shared data instead of unpickling it
+        pool = multiprocessing.Pool(processes=1)
+        try:
+            iitax = pool.apply(attached_iitax, (dirname,))
+        finally:
+            pool.close()
+            pool.join()
+        assert_array_equal(iitax, calc.records.iitax)
+    finally:
+        shutil.rmtree(dirname)
+
+
+def test_lazy_allocation(cps_subsample):
+    data = cps_subsample.drop(['e03150', 'e03210'], axis=1)
+    rec = Records.cps_constructor(data=data)
+    # unread input variables share one read-only array of zeros
+    assert 'e03150' not in rec.__dict__
+    assert rec.e03150 is rec.e03210
+    assert not rec.e03150.flags.writeable
+    assert np.all(rec.e03150 == 0.)
+    with pytest.raises(ValueError):
+        rec.e03150 += 1.
+    rec.make_writable(['e03150'])
+    rec.e03150 += 1.
+    assert np.all(rec.e03150 == 1.) and np.all(rec.e03210 == 0.)
+    # calculated variables are allocated when first used
+    assert 'ubi' not in rec.__dict__
+    rec.ubi += 1.
+    assert 'ubi' in rec.__dict__
+    assert np.all(rec.ubi == 1.)
+    rec2 = copy.deepcopy(rec)
+    assert 'e03210' not in rec2.__dict__ and 'iitax' not in rec2.__dict__
+    assert_array_equal(rec2.ubi, rec.ubi)
+    with pytest.raises(AttributeError):
+        rec.nonexistent_variable
+
+
+def test_age_to(cps_subsample):
+    ratios = pd.read_csv(os.path.join(Records.CUR_PATH,
+                                      Records.PUF_RATIOS_FILENAME),
+                         index_col=0).transpose()
+    rec1 = Records.cps_constructor(data=cps_subsample)
+    rec1.ADJ = ratios
+    rec1.agi_bin[:] = np.arange(rec1.dim) % len(ratios)
+    rec2 = copy.deepcopy(rec1)
+    with pytest.raises(ValueError):
+        rec1.age_to(rec1.current_year - 1)
+    rec1.age_to(rec1.current_year)
+    assert rec1.current_year == rec2.current_year
+    # one-step aging gives exactly the same results as year-by-year aging
+    for _ in range(6):
+        rec1.increment_year()
+    rec2.age_to(rec1.current_year)
+    assert rec2.current_year == rec1.current_year
+    assert_array_equal(rec2.s006, rec1.s006)
+    for varname in Records.USABLE_READ_VARS:
+        assert_array_equal(getattr(rec2, varname), getattr(rec1, varname))
+    assert np.any(rec2.e00900 < 0.) and np.any(rec2.e00900 > 0.)
+
+
+def test_signed_growfactors():
+    funit = (
+        u'RECID,MARS,e00900,e00900p,e02000\n'
+        u'1,    2,   1000,  1000,   -500\n'
+        u'2,    1,   -800,  -800,   0\n'
+    )
+    gfactors = Growfactors()
+    rec = Records(data=pd.read_csv(StringIO(funit)), gfactors=gfactors,
+                  weights=None, start_year=2009)
+    rec.age_to(2011)
+    # grow factors for 2009 data year are applied by Records constructor
+    cci, ccl, cel = [np.prod([gfactors.factor_value(name, year)
+                              for year in range(2009, 2012)])
+                     for name in ['ASCHCI', 'ASCHCL', 'ASCHEL']]
+    assert np.allclose(rec.e00900, [1000. * cci, -800. * ccl])
+    assert np.allclose(rec.e00900p, rec.e00900)
+    assert np.allclose(rec.e02000, [-500. * cel, 0.])
+    # non-positive grow factors can change the sign of a value
+    gfactors = Growfactors()
+    aschcl = Growfactors().factor_value('ASCHCL', 2010)
+    gfactors.update('ASCHCL', 2010, -1. - aschcl)
+    rec = Records(data=pd.read_csv(StringIO(funit)), gfactors=gfactors,
+                  weights=None, start_year=2009)
+    rec.age_to(2011)
+    assert rec.e00900[1] > 0.
+    assert np.allclose(rec.e00900[1],
+                       800. * gfactors.factor_value('ASCHCL', 2009) *
+                       gfactors.factor_value('ASCHCI', 2011))
+
+
+def test_write_npz(cps_subsample):
+    dirname = tempfile.mkdtemp()
+    try:
+        npz_path = os.path.join(dirname, 'cps' + Records.NPZ_SUFFIX)
+        with pytest.raises(ValueError):
+            Records.write_npz(cps_subsample, os.path.join(dirname, 'cps'))
+        with pytest.raises(ValueError):
+            Records.write_npz(list(), npz_path)
+        data = cps_subsample.copy()
+        data['unused'] = 1.
+        Records.write_npz(data, npz_path)
+        npz = np.load(npz_path)
+        assert 'unused' not in npz.files
+        assert npz['MARS'].dtype == np.int64
+        assert npz['e00200'].dtype == np.float64
+        npz.close()
+        rec1 = Records.cps_constructor(data=cps_subsample.reset_index())
+        rec2 = Records.cps_constructor(data=npz_path)
+        assert rec2.dim == rec1.dim
+        assert rec2.IGNORED_VARS == set()
+        for varname in Records.USABLE_READ_VARS | Records.CALCULATED_VARS:
+            value1 = getattr(rec1, varname)
+            value2 = getattr(rec2, varname)
+            assert value2.dtype == value1.dtype
+            assert_array_equal(value2, value1)
+    finally:
+        shutil.rmtree(dirname)
+
+
+def test_write_columns(cps_subsample):
+    dirname = tempfile.mkdtemp()
+    try:
+        with pytest.raises(ValueError):
+            Records.cps_constructor(data=dirname)
+        coldir = os.path.join(dirname, 'cps_columns')
+        Records.write_columns(cps_subsample, coldir)
+        rec1 = Records.cps_constructor(data=cps_subsample.reset_index())
+        rec2 = Records.cps_constructor(data=coldir)
+        assert rec2.dim == rec1.dim
+        for varname in Records.USABLE_READ_VARS | Records.CALCULATED_VARS:
+            assert_array_equal(getattr(rec2, varname),
+                               getattr(rec1, varname))
+        # input variables are memory-mapped copy-on-write, so aging the
+        # data does not change the column files
+        assert isinstance(rec2.e00200, np.memmap)
+        assert not isinstance(rec2.iitax, np.memmap)
+        rec2.increment_year()
+        rec3 = Records.cps_constructor(data=coldir)
+        assert_array_equal(rec3.e00200, rec1.e00200)
+        assert not np.allclose(rec2.e00200, rec3.e00200)
+    finally:
+        shutil.rmtree(dirname)
+
+
+def test_compact_dtypes(cps_subsample):
+    rec1 = Records.cps_constructor(data=cps_subsample)
+    rec2 = Records.cps_constructor(data=cps_subsample, compact_dtypes=True)
+    assert rec2.MARS.dtype == np.int8
+    assert rec2.num.dtype == np.int8
+    assert rec2.age_head.dtype == np.int16
+    assert rec2.e17500.dtype == np.float32
+    assert rec2.e00200.dtype == np.float64
+    assert rec2.iitax.dtype == np.float64
+    assert_array_equal(rec2.MARS, rec1.MARS)
+    assert_array_equal(rec2.num, rec1.num)
+    # tax results are within the documented tolerance
+    calc1 = Calculator(policy=Policy(), records=rec1, verbose=False)
+    calc2 = Calculator(policy=Policy(), records=rec2, verbose=False)
+    calc1.advance_to_year(2020)
+    calc2.advance_to_year(2020)
+    calc1.calc_all()
+    calc2.calc_all()
+    for varname in ['iitax', 'payrolltax', 'combined']:
+        tax1 = getattr(calc1.records, varname)
+        tax2 = getattr(calc2.records, varname)
+        assert np.allclose(tax2, tax1, rtol=0.0, atol=1.0)
+        total1 = (tax1 * calc1.records.s006).sum()
+        total2 = (tax2 * calc2.records.s006).sum()
+        assert abs(total2 - total1) < 1e-7 * abs(total1)
+    # integer values must fit in their compact type
+    data = cps_subsample.copy()
+    data['XTOT'] = 200
+    with pytest.raises(ValueError):
+        Records.cps_constructor(data=data, compact_dtypes=True)
+
+
+def test_block_storage(cps_subsample):
+    rec1 = Records.cps_constructor(data=cps_subsample)
+    rec2 = Records.cps_constructor(data=cps_subsample, block_storage=True)
+    # variable arrays are views of the rows of one block for each type
+    assert rec2.e00200.base is not None
+    assert rec2.e00200.base is rec2.iitax.base
+    assert rec2.MARS.base is rec2.num.base
+    assert rec2.e00200.base is not rec2.MARS.base
+    # tax results are exactly the same
+    calc1 = Calculator(policy=Policy(), records=rec1, verbose=False)
+    calc2 = Calculator(policy=Policy(), records=rec2, verbose=False)
+    calc1.advance_to_year(2020)
+    calc2.advance_to_year(2020)
+    calc1.calc_all()
+    calc2.calc_all()
+    mtr1 = calc1.mtr('e00200p')
+    mtr2 = calc2.mtr('e00200p')
+    for arr1, arr2 in zip(mtr1, mtr2):
+        assert_array_equal(arr2, arr1)
+    dframe1 = rec1.to_dataframe()
+    dframe2 = rec2.to_dataframe()
+    assert set(dframe2.columns) == set(dframe1.columns)
+    for varname in dframe1.columns:
+        assert_array_equal(dframe2[varname].values, dframe1[varname].values)
+    assert list(rec2.to_dataframe(['iitax', 'MARS']).columns) == ['iitax',
+                                                                  'MARS']
+    # replaced arrays are copied into the blocks by whole-record operations
+    snap = rec2.snapshot(['e00200', 'iitax'])
+    rec2.e00200 = rec2.e00200 + 1.
+    rec3 = copy.deepcopy(rec2)
+    assert rec3.e00200.base is rec3.iitax.base
+    assert_array_equal(rec3.e00200, snap['e00200'] + 1.)
+    rec3.e00200 += 1.
+    assert_array_equal(rec2.e00200, snap['e00200'] + 1.)
+    rec2.zero_out_changing_calculated_vars()
+    assert np.all(rec2.iitax == 0.)
+    assert np.any(rec3.iitax != 0.)
+    rec2.restore(snap)
+    assert_array_equal(rec2.e00200, rec1.e00200)
+    assert_array_equal(rec2.iitax, rec1.iitax)
+    rec4 = pickle.loads(pickle.dumps(rec2))
+    assert rec4.e00200.base is rec4.iitax.base
+    assert_array_equal(rec4.iitax, rec1.iitax)
+    # blocks are shared as single memory-mapped files
+    dirname = tempfile.mkdtemp()
+    try:
+        rec2.share_columns(dirname)
+        assert isinstance(rec2.e00200.base, np.memmap)
+        rec5 = Records.attach_shared(dirname)
+        assert rec5.e00200.base is rec5.iitax.base
+        assert_array_equal(rec5.iitax, rec1.iitax)
+        assert_array_equal(rec5.MARS, rec1.MARS)
+        del rec2, rec5
+    finally:
+        shutil.rmtree(dirname)
+
+
 @pytest.mark.parametrize("csv", [
     (
         u'RECID,MARS,e00200,e00200p,e00200s\n'
@@ -127,6 +447,15 @@ def test_records_variables_content(tests_path):
             # check that required is true if it is present
             if 'required' in variable:
                 assert variable['required'] is True
+            # check that growfactor names one or two valid grow factors
+            if 'growfactor' in variable:
+                assert iotype == 'read' and variable['type'] == 'float'
+                gfnames = variable['growfactor']
+                if isinstance(gfnames, list):
+                    assert len(gfnames) == 2
+                else:
+                    gfnames = [gfnames]
+                assert set(gfnames) <= Growfactors.VALID_NAMES
             # check that forminfo is dictionary with sensible year ranges
             forminfo = variable['form']
             assert isinstance(forminfo, dict)
@@ -25,9 +25,11 @@ from taxcalc.utils import (STATS_COLUMNS,
                            weighted_perc_inc, weighted_perc_cut,
                            add_income_bins, add_quantile_bins,
                            multiyear_diagnostic_table,
+                           multiyear_distribution_tables,
                            mtr_graph_data, atr_graph_data,
                            xtr_graph_plot, write_graph_file,
                            read_egg_csv, read_egg_json, delete_file,
+                           process_pool,
                            bootstrap_se_ci,
                            certainty_equivalent, ce_aftertax_income)
 
@@ -737,6 +739,47 @@ def test_multiyear_diagnostic_table(cps_subsample):
     assert isinstance(adt, pd.DataFrame)
 
 
+def test_multiyear_diagnostic_table_in_parallel(cps_subsample):
+    pol = Policy()
+    reform = {
+        2013: {
+            '_AGI_surtax_trt': [0.05],
+            '_ID_BenefitSurtax_crt': [0.2],
+            '_ID_BenefitSurtax_trt': [0.1]
+        }}
+    pol.implement_reform(reform)
+    calc = Calculator(policy=pol,
+                      records=Records.cps_constructor(data=cps_subsample))
+    with pytest.raises(ValueError):
+        multiyear_diagnostic_table(calc, 3, num_workers=0)
+    adt1 = multiyear_diagnostic_table(calc, 3)
+    adt2 = multiyear_diagnostic_table(calc, 3, num_workers=2)
+    assert calc.records.iitax.sum() == 0.
+    assert adt1.equals(adt2)
+    # reform surtaxes in each year do not include those of previous years
+    calc.advance_to_year(2016)
+    calc.calc_all()
+    surtaxes = (calc.records.surtax * calc.records.s006).sum() * 1e-9
+    assert np.allclose(adt1.loc['Reform Surtaxes ($b)', 2016], surtaxes)
+
+
+def test_multiyear_distribution_tables(cps_subsample):
+    calc = Calculator(policy=Policy(),
+                      records=Records.cps_constructor(data=cps_subsample))
+    with pytest.raises(ValueError):
+        multiyear_distribution_tables(calc, 0, 'weighted_deciles',
+                                      'expanded_income', 'weighted_sum')
+    tables = multiyear_distribution_tables(calc, 2, 'weighted_deciles',
+                                           'expanded_income', 'weighted_sum')
+    assert list(tables.keys()) == [2014, 2015]
+    assert calc.records.iitax.sum() == 0.
+    calc.increment_year()
+    calc.calc_all()
+    dist = create_distribution_table(calc.records, 'weighted_deciles',
+                                     'expanded_income', 'weighted_sum')
+    assert tables[2015].equals(dist)
+
+
 def test_myr_diag_table_wo_behv(cps_subsample):
     pol = Policy()
     reform = {
@@ -838,6 +881,17 @@ def test_create_delete_temp_file():
     assert os.path.isfile(fname) is False
 
 
+def test_process_pool():
+    pool = process_pool(processes=2)
+    try:
+        assert pool.map(abs, [-1, -2, 3]) == [1, 2, 3]
+        # pylint: disable=protected-access
+        assert pool._ctx.get_start_method() in ('forkserver', 'spawn')
+    finally:
+        pool.close()
+        pool.join()
+
+
 def test_bootstrap_se_ci():
     # Use treated mouse data from Table 2.1 and
     # results from Table 2.2 and Table 13.1 in
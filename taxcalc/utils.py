@@ -9,9 +9,10 @@ PUBLIC utility functions for Tax-Calculator.
 
 import os
 import math
-import copy
 import json
+import functools
 import collections
+import multiprocessing
 import pkg_resources
 import six
 import numpy as np
@@ -491,101 +492,147 @@ def create_diagnostic_table(calc):
     -------
     Pandas DataFrame object containing the table for calc.current_year
     """
-    def diagnostic_table_odict(recs):
-        """
-        Nested function that extracts diagnostic table dictionary from
-        the specified Records object, recs.
+    odict = _diagnostic_table_odict(calc.records)
+    return _diagnostic_table_dataframe(odict, calc.current_year)
 
-        Parameters
-        ----------
-        recs : Records class object
 
-        Returns
-        -------
-        ordered dictionary of variable names and aggregate weighted values
-        """
-        # aggregate weighted values expressed in millions or billions
-        in_millions = 1.0e-6
-        in_billions = 1.0e-9
-        odict = collections.OrderedDict()
-        # total number of filing units
-        odict['Returns (#m)'] = recs.s006.sum() * in_millions
-        # adjusted gross income
-        odict['AGI ($b)'] = (recs.c00100 * recs.s006).sum() * in_billions
-        # number of itemizers
-        num = (recs.s006[(recs.c04470 > 0.) * (recs.c00100 > 0.)].sum())
-        odict['Itemizers (#m)'] = num * in_millions
-        # itemized deduction
-        ided1 = recs.c04470 * recs.s006
-        val = ided1[recs.c04470 > 0.].sum()
-        odict['Itemized Deduction ($b)'] = val * in_billions
-        # number of standard deductions
-        num = recs.s006[(recs.standard > 0.) * (recs.c00100 > 0.)].sum()
-        odict['Standard Deduction Filers (#m)'] = num * in_millions
-        # standard deduction
-        sded1 = recs.standard * recs.s006
-        val = sded1[(recs.standard > 0.) * (recs.c00100 > 0.)].sum()
-        odict['Standard Deduction ($b)'] = val * in_billions
-        # personal exemption
-        val = (recs.c04600 * recs.s006)[recs.c00100 > 0.].sum()
-        odict['Personal Exemption ($b)'] = val * in_billions
-        # taxable income
-        val = (recs.c04800 * recs.s006).sum()
-        odict['Taxable Income ($b)'] = val * in_billions
-        # regular tax liability
-        val = (recs.taxbc * recs.s006).sum()
-        odict['Regular Tax ($b)'] = val * in_billions
-        # AMT taxable income
-        odict['AMT Income ($b)'] = ((recs.c62100 * recs.s006).sum() *
-                                    in_billions)
-        # total AMT liability
-        odict['AMT Liability ($b)'] = ((recs.c09600 * recs.s006).sum() *
-                                       in_billions)
-        # number of people paying AMT
-        odict['AMT Filers (#m)'] = (recs.s006[recs.c09600 > 0.].sum() *
-                                    in_millions)
-        # tax before credits
-        val = (recs.c05800 * recs.s006).sum()
-        odict['Tax before Credits ($b)'] = val * in_billions
-        # refundable credits
-        val = (recs.refund * recs.s006).sum()
-        odict['Refundable Credits ($b)'] = val * in_billions
-        # nonrefundable credits
-        val = (recs.c07100 * recs.s006).sum()
-        odict['Nonrefundable Credits ($b)'] = val * in_billions
-        # reform surtaxes (part of federal individual income tax liability)
-        val = (recs.surtax * recs.s006).sum()
-        odict['Reform Surtaxes ($b)'] = val * in_billions
-        # other taxes on Form 1040
-        val = (recs.othertaxes * recs.s006).sum()
-        odict['Other Taxes ($b)'] = val * in_billions
-        # federal individual income tax liability
-        val = (recs.iitax * recs.s006).sum()
-        odict['Ind Income Tax ($b)'] = val * in_billions
-        # OASDI+HI payroll tax liability (including employer share)
-        val = (recs.payrolltax * recs.s006).sum()
-        odict['Payroll Taxes ($b)'] = val * in_billions
-        # combined income and payroll tax liability
-        val = (recs.combined * recs.s006).sum()
-        odict['Combined Liability ($b)'] = val * in_billions
-        # number of tax units with non-positive income tax liability
-        num = (recs.s006[recs.iitax <= 0]).sum()
-        odict['With Income Tax <= 0 (#m)'] = num * in_millions
-        # number of tax units with non-positive combined tax liability
-        num = (recs.s006[recs.combined <= 0]).sum()
-        odict['With Combined Tax <= 0 (#m)'] = num * in_millions
-        return odict
-    # tabulate diagnostic table
-    odict = diagnostic_table_odict(calc.records)
+def create_chunked_diagnostic_table(calcs):
+    """
+    Extract diagnostic table from specified iterable of Calculator objects,
+    each of which contains a disjoint chunk of the filing units for the
+    same year (for example, the generator returned by the
+    Calculator.calc_all_chunked method).  The table aggregates are
+    accumulated one chunk at a time, so only one chunk needs to be in
+    memory at a time.
+
+    Parameters
+    ----------
+    calcs : iterable of Calculator class objects
+
+    Returns
+    -------
+    Pandas DataFrame object containing the table for the calcs current_year
+    """
+    odict = None
+    year = None
+    for calc in calcs:
+        chunk_odict = _diagnostic_table_odict(calc.records)
+        if odict is None:
+            odict = chunk_odict
+            year = calc.current_year
+        else:
+            if calc.current_year != year:
+                msg = 'calcs current_year values are not all the same'
+                raise ValueError(msg)
+            for key in odict:
+                odict[key] += chunk_odict[key]
+    if odict is None:
+        raise ValueError('calcs contains no Calculator objects')
+    return _diagnostic_table_dataframe(odict, year)
+
+
+def _diagnostic_table_odict(recs):
+    """
+    Private function that extracts diagnostic table dictionary from
+    the specified Records object, recs.  Because each value is an
+    aggregate weighted sum, the values for disjoint sets of filing
+    units can be added together.
+
+    Parameters
+    ----------
+    recs : Records class object
+
+    Returns
+    -------
+    ordered dictionary of variable names and aggregate weighted values
+    """
+    # aggregate weighted values expressed in millions or billions
+    in_millions = 1.0e-6
+    in_billions = 1.0e-9
+    odict = collections.OrderedDict()
+    # total number of filing units
+    odict['Returns (#m)'] = recs.s006.sum() * in_millions
+    # adjusted gross income
+    odict['AGI ($b)'] = (recs.c00100 * recs.s006).sum() * in_billions
+    # number of itemizers
+    num = (recs.s006[(recs.c04470 > 0.) * (recs.c00100 > 0.)].sum())
+    odict['Itemizers (#m)'] = num * in_millions
+    # itemized deduction
+    ided1 = recs.c04470 * recs.s006
+    val = ided1[recs.c04470 > 0.].sum()
+    odict['Itemized Deduction ($b)'] = val * in_billions
+    # number of standard deductions
+    num = recs.s006[(recs.standard > 0.) * (recs.c00100 > 0.)].sum()
+    odict['Standard Deduction Filers (#m)'] = num * in_millions
+    # standard deduction
+    sded1 = recs.standard * recs.s006
+    val = sded1[(recs.standard > 0.) * (recs.c00100 > 0.)].sum()
+    odict['Standard Deduction ($b)'] = val * in_billions
+    # personal exemption
+    val = (recs.c04600 * recs.s006)[recs.c00100 > 0.].sum()
+    odict['Personal Exemption ($b)'] = val * in_billions
+    # taxable income
+    val = (recs.c04800 * recs.s006).sum()
+    odict['Taxable Income ($b)'] = val * in_billions
+    # regular tax liability
+    val = (recs.taxbc * recs.s006).sum()
+    odict['Regular Tax ($b)'] = val * in_billions
+    # AMT taxable income
+    odict['AMT Income ($b)'] = ((recs.c62100 * recs.s006).sum() *
+                                in_billions)
+    # total AMT liability
+    odict['AMT Liability ($b)'] = ((recs.c09600 * recs.s006).sum() *
+                                   in_billions)
+    # number of people paying AMT
+    odict['AMT Filers (#m)'] = (recs.s006[recs.c09600 > 0.].sum() *
+                                in_millions)
+    # tax before credits
+    val = (recs.c05800 * recs.s006).sum()
+    odict['Tax before Credits ($b)'] = val * in_billions
+    # refundable credits
+    val = (recs.refund * recs.s006).sum()
+    odict['Refundable Credits ($b)'] = val * in_billions
+    # nonrefundable credits
+    val = (recs.c07100 * recs.s006).sum()
+    odict['Nonrefundable Credits ($b)'] = val * in_billions
+    # reform surtaxes (part of federal individual income tax liability)
+    val = (recs.surtax * recs.s006).sum()
+    odict['Reform Surtaxes ($b)'] = val * in_billions
+    # other taxes on Form 1040
+    val = (recs.othertaxes * recs.s006).sum()
+    odict['Other Taxes ($b)'] = val * in_billions
+    # federal individual income tax liability
+    val = (recs.iitax * recs.s006).sum()
+    odict['Ind Income Tax ($b)'] = val * in_billions
+    # OASDI+HI payroll tax liability (including employer share)
+    val = (recs.payrolltax * recs.s006).sum()
+    odict['Payroll Taxes ($b)'] = val * in_billions
+    # combined income and payroll tax liability
+    val = (recs.combined * recs.s006).sum()
+    odict['Combined Liability ($b)'] = val * in_billions
+    # number of tax units with non-positive income tax liability
+    num = (recs.s006[recs.iitax <= 0]).sum()
+    odict['With Income Tax <= 0 (#m)'] = num * in_millions
+    # number of tax units with non-positive combined tax liability
+    num = (recs.s006[recs.combined <= 0]).sum()
+    odict['With Combined Tax <= 0 (#m)'] = num * in_millions
+    return odict
+
+
+def _diagnostic_table_dataframe(odict, year):
+    """
+    Private function that converts the specified diagnostic table
+    dictionary for the specified year into a Pandas DataFrame.
+    """
     pdf = pd.DataFrame(data=odict,
-                       index=[calc.current_year],
+                       index=[year],
                        columns=odict.keys())
     pdf = pdf.transpose()
     pd.options.display.float_format = '{:8,.1f}'.format
     return pdf
 
 
-def multiyear_diagnostic_table(calc, num_years=0):
+def multiyear_diagnostic_table(calc, num_years=0, num_workers=1):
     """
     Generate multi-year diagnostic table from specified Calculator object.
     This function leaves the specified calc object unchanged.
@@ -596,10 +643,68 @@ def multiyear_diagnostic_table(calc, num_years=0):
 
     num_years : integer (must be between 1 and number of available calc years)
 
+    num_workers : integer
+        number of worker processes among which the tax calculations for
+        the num_years years are divided; default value is one, which
+        implies the tax calculations are done in this process.  When it
+        is greater than one, the data for each year are extrapolated in
+        this process and shared with a worker process that calls
+        calc_all() for that year (see the Calculator.annual_results
+        method), so the years are calculated in parallel and the table is
+        the same as the one generated when num_workers is one.
+
     Returns
     -------
     Pandas DataFrame object containing the multi-year diagnostic table
     """
+    _check_num_years(calc, num_years)
+    results = calc.annual_results(num_years, _calc_diagnostic_table_odict,
+                                  num_workers)
+    dtlist = [_diagnostic_table_dataframe(odict, year)
+              for odict, year in results]
+    return pd.concat(dtlist, axis=1)
+
+
+def multiyear_distribution_tables(calc, num_years, groupby, income_measure,
+                                  result_type, num_workers=1):
+    """
+    Generate distribution table for each of num_years years beginning with
+    the current year of the specified Calculator object.  This function
+    leaves the specified calc object unchanged.
+
+    Parameters
+    ----------
+    calc : Calculator class object
+
+    num_years : integer (must be between 1 and number of available calc years)
+
+    groupby, income_measure, result_type : String objects
+        see the create_distribution_table function
+
+    num_workers : integer
+        number of worker processes among which the tax calculations for
+        the num_years years are divided (see multiyear_diagnostic_table)
+
+    Returns
+    -------
+    ordered dictionary of Pandas DataFrame objects containing the
+    distribution table for each year with the year as key
+    """
+    # pylint: disable=too-many-arguments
+    _check_num_years(calc, num_years)
+    function = functools.partial(_calc_distribution_table,
+                                 groupby=groupby,
+                                 income_measure=income_measure,
+                                 result_type=result_type)
+    results = calc.annual_results(num_years, function, num_workers)
+    return collections.OrderedDict(results)
+
+
+def _check_num_years(calc, num_years):
+    """
+    Private function that raises ValueError if num_years is not between
+    one and the number of available years of the specified calc object.
+    """
     if num_years < 1:
         msg = 'num_year={} is less than one'.format(num_years)
         raise ValueError(msg)
@@ -608,14 +713,26 @@ def multiyear_diagnostic_table(calc, num_years=0):
         msg = ('num_year={} is greater '
                'than max_num_years={}').format(num_years, max_num_years)
         raise ValueError(msg)
-    cal = copy.deepcopy(calc)
-    dtlist = list()
-    for iyr in range(1, num_years + 1):
-        cal.calc_all()
-        dtlist.append(create_diagnostic_table(cal))
-        if iyr < num_years:
-            cal.increment_year()
-    return pd.concat(dtlist, axis=1)
+
+
+def _calc_diagnostic_table_odict(calc):
+    """
+    Private function that returns the diagnostic table dictionary and
+    current_year of the specified calc object, for which calc_all() has
+    been called, possibly in a worker process.
+    """
+    return (_diagnostic_table_odict(calc.records), calc.current_year)
+
+
+def _calc_distribution_table(calc, groupby, income_measure, result_type):
+    """
+    Private function that returns the current_year and the distribution
+    table of the specified calc object, for which calc_all() has been
+    called, possibly in a worker process.
+    """
+    return (calc.current_year,
+            create_distribution_table(calc.records, groupby,
+                                      income_measure, result_type))
 
 
 def mtr_graph_data(calc1, calc2,
@@ -1294,6 +1411,26 @@ def delete_file(filename):
         os.remove(filename)
 
 
+def process_pool(processes, initializer=None, initargs=()):
+    """
+    Return a multiprocessing Pool object with the specified number of
+    worker processes, which are started using the forkserver method (or
+    the spawn method where forkserver is not available) rather than by
+    forking this process.  A process that has executed parallel loops
+    compiled by numba (see the Calculator num_threads argument) may not
+    be forked safely, and the worker processes need only import the
+    taxcalc package to execute the module-level functions they are given.
+    Note that the worker processes do not inherit the functions already
+    compiled by numba in this process.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+    else:
+        context = multiprocessing.get_context('spawn')
+    return context.Pool(processes=processes, initializer=initializer,
+                        initargs=initargs)
+
+
 def bootstrap_se_ci(data, seed, num_samples, statistic, alpha):
     """
     Return bootstrap estimate of standard error of statistic and